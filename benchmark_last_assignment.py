@@ -0,0 +1,508 @@
+import argparse
+import copy
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+import last_assignment as la
+import five_oh_six_utils as utl
+
+from pathlib import Path
+
+
+# Constants
+BASE_SIZES = {
+    "planets": 60,
+    "starships": 40,
+    "people": 40,
+    "droids": 15,
+    "episodes": 133,
+    "articles": 100,
+}  # fallback 1x sizes used when a data file is not available (see get_base_sizes)
+BASE_SIZE_SOURCES = {
+    "planets": "wookiee_planets",
+    "starships": "wookiee_starships",
+    "people": "wookiee_people",
+    "droids": "wookiee_droids",
+    "episodes": "clone_wars_episodes",
+    "articles": "articles",
+}  # dataset and la.REFERENCE_SOURCES name key-value pairs
+KEYS_FILEPATH = "data-key_mappings.json"
+NEWS_DESKS = ("Arts&Leisure", "Business", "Culture", "Foreign", "Movies", "National", "None", "")
+NONE_DENSITY = 0.15  # share of values drawn from NONE_VALUES
+SCALES = (1, 10, 100, 1000)
+SEED = 506
+
+# Key mappings used if data-key_mappings.json is not available (see transform_* "Mappings")
+SYNTHETIC_KEYS = {
+    "planet": {
+        "url": "url",
+        "name": "name",
+        "region": "region",
+        "sector": "sector",
+        "suns": "suns",
+        "moons": "moons",
+        "orbital_period": "orbital_period_days",
+        "diameter": "diameter_km",
+        "gravity": "gravity_std",
+        "atmosphere": "atmosphere",
+        "climate": "climate",
+        "terrain": "terrain",
+        "population": "population",
+    },
+    "starship": {
+        "url": "url",
+        "name": "name",
+        "model": "model",
+        "starship_class": "starship_class",
+        "manufacturer": "manufacturer",
+        "length": "length_m",
+        "hyperdrive_rating": "hyperdrive_rating",
+        "MGLT": "max_megalight_hr",
+        "max_atmosphering_speed": "max_atmosphering_speed_kph",
+        "crew": "crew_size",
+        "crew_members": "crew_members",
+        "passengers": "max_passengers",
+        "passengers_on_board": "passengers_on_board",
+        "cargo_capacity": "cargo_capacity_kg",
+        "consumables": "consumables",
+        "armament": "armament",
+    },
+    "person": {
+        "url": "url",
+        "name": "name",
+        "birth_year": "birth_date",
+        "height": "height_cm",
+        "mass": "mass_kg",
+        "homeworld": "homeworld",
+        "species": "species",
+        "force_sensitive": "force_sensitive",
+    },
+    "droid": {
+        "url": "url",
+        "name": "name",
+        "model": "model",
+        "manufacturer": "manufacturer",
+        "create_year": "create_date",
+        "height": "height_cm",
+        "mass": "mass_kg",
+        "equipment": "equipment",
+        "instructions": "instructions",
+    },
+}
+
+
+def benchmark(name, scale, rows, func, *args):
+    """Calls < func > with the passed in < args > twice: once to measure elapsed wall clock
+    time and once with < tracemalloc > tracing enabled to measure peak memory. Argument
+    objects are deep copied before each call (outside the measured region) so that functions
+    that mutate their input (e.g., < convert_episode_values() >) start from the same state.
+
+    Parameters:
+        name (str): benchmark name
+        scale (int): data size multiplier
+        rows (int): number of records processed by < func >
+        func (function): function to benchmark
+        args (tuple): arguments passed to < func >
+
+    Returns:
+        dict: benchmark result
+    """
+
+    timed_args = copy.deepcopy(args)
+    start = time.perf_counter()
+    func(*timed_args)
+    elapsed = time.perf_counter() - start
+
+    traced_args = copy.deepcopy(args)
+    tracemalloc.start()
+    func(*traced_args)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return {
+        "benchmark": name,
+        "scale": scale,
+        "rows": rows,
+        "seconds": round(elapsed, 6),
+        "rows_per_s": round(rows / elapsed) if elapsed else None,
+        "peak_mem_kb": round(peak / 1024, 1),
+    }
+
+
+def get_base_sizes():
+    """Returns the 1x size of each synthetic dataset. Each size is the number of records in the
+    corresponding data file listed in < la.REFERENCE_SOURCES >; if the data file is not
+    available the size listed in < BASE_SIZES > is used.
+
+    Parameters:
+        None
+
+    Returns:
+        dict: dataset and record count key-value pairs
+    """
+
+    sizes = {}
+    for dataset, source in BASE_SIZE_SOURCES.items():
+        filepath = la.REFERENCE_SOURCES[source]
+        if not Path(filepath).exists():
+            sizes[dataset] = BASE_SIZES[dataset]
+        elif filepath.endswith(".csv"):
+            sizes[dataset] = len(utl.read_csv_to_dicts(filepath))
+        else:
+            sizes[dataset] = len(utl.read_json(filepath))
+    return sizes
+
+
+def maybe_none(rng, value):
+    """Returns a value drawn from < la.NONE_VALUES > with probability < NONE_DENSITY >;
+    otherwise returns the passed in < value >.
+
+    Parameters:
+        rng (random.Random): random number generator
+        value (str): value to return
+
+    Returns:
+        str: value or none value
+    """
+
+    return rng.choice(la.NONE_VALUES) if rng.random() < NONE_DENSITY else value
+
+
+def make_article(rng, i):
+    """Returns a synthetic New York Times article.
+
+    Parameters:
+        rng (random.Random): random number generator
+        i (int): record number
+
+    Returns:
+        dict: article
+    """
+
+    return {
+        "web_url": f"https://www.nytimes.com/{i}.html",
+        "headline": {"main": f"Headline {i}"},
+        "news_desk": rng.choice(NEWS_DESKS),
+        "byline": {"original": f"By Reporter {i % 50}"},
+        "document_type": "article",
+        "type_of_material": rng.choice(("News", "Review", "Op-Ed")),
+        "abstract": f"Abstract {i}",
+        "word_count": rng.randint(100, 3000),
+        "pub_date": f"20{rng.randint(10, 23)}-0{rng.randint(1, 9)}-1{rng.randint(0, 9)}T00:00:00+0000",
+    }
+
+
+def make_droid(rng, i):
+    """Returns a synthetic Wookieepedia/SWAPI droid.
+
+    Parameters:
+        rng (random.Random): random number generator
+        i (int): record number
+
+    Returns:
+        dict: droid
+    """
+
+    return {
+        "url": f"{la.SWAPI_PEOPLE}{i}/",
+        "name": f"R{i}-D{i % 10}",
+        "model": maybe_none(rng, rng.choice(("R2-series", "3PO-series", "BB-series"))),
+        "manufacturer": maybe_none(rng, rng.choice(("Industrial Automaton", "Cybot Galactica"))),
+        "create_year": maybe_none(rng, f"{rng.randint(0, 100)}BBY"),
+        "height": maybe_none(rng, str(rng.randint(50, 200))),
+        "mass": maybe_none(rng, f"{rng.randint(20, 150)}.{rng.randint(0, 9)}"),
+        "equipment": maybe_none(rng, "Astromech arm|Fire extinguisher|Holoprojector"),
+        "instructions": maybe_none(rng, "Deliver the plans,Find Obi-Wan"),
+        "homeworld": f"{la.SWAPI_PLANETS}{rng.randint(1, 10)}/",
+    }
+
+
+def make_episode(rng, i):
+    """Returns a synthetic Clone Wars episode as read from data-clone_wars_episodes.csv.
+
+    Parameters:
+        rng (random.Random): random number generator
+        i (int): record number
+
+    Returns:
+        dict: episode
+    """
+
+    return {
+        "series_title": "Star Wars: The Clone Wars",
+        "series_season_num": str(i // 22 + 1),
+        "series_episode_num": str(i + 1),
+        "season_episode_num": maybe_none(rng, str(i % 22 + 1)),
+        "episode_title": f"Episode {i}",
+        "episode_director": rng.choice(("Dave Filoni", "Brian Kalin O'Connell", "Kyle Dunlevy")),
+        "episode_writers": maybe_none(rng, "Henry Gilroy, Steven Melching"),
+        "episode_release_date": "2008-10-03",
+        "episode_prod_code": maybe_none(rng, f"{i // 22 + 1}.{i % 22 + 1:02d}"),
+        "episode_us_viewers_mm": maybe_none(rng, f"{rng.uniform(1, 5):.2f}"),
+    }
+
+
+def make_person(rng, i):
+    """Returns a synthetic Wookieepedia/SWAPI person.
+
+    Parameters:
+        rng (random.Random): random number generator
+        i (int): record number
+
+    Returns:
+        dict: person
+    """
+
+    return {
+        "url": f"{la.SWAPI_PEOPLE}{i}/",
+        "name": f"Person {i}",
+        "birth_year": maybe_none(rng, f"{rng.randint(0, 900)}{rng.choice(('BBY', 'ABY'))}"),
+        "height": maybe_none(rng, str(rng.randint(60, 250))),
+        "mass": maybe_none(rng, f"{rng.randint(20, 358)}.{rng.randint(0, 9)}"),
+        "homeworld": f"{la.SWAPI_PLANETS}{rng.randint(1, 10)}/",
+        "species": [f"{la.SWAPI_SPECIES}{rng.randint(1, 5)}/"],
+        "force_sensitive": maybe_none(rng, rng.choice(("True", "False"))),
+    }
+
+
+def make_planet(rng, i):
+    """Returns a synthetic Wookieepedia planet as read from data-wookieepedia_planets.csv.
+
+    Parameters:
+        rng (random.Random): random number generator
+        i (int): record number
+
+    Returns:
+        dict: planet
+    """
+
+    return {
+        "url": f"https://starwars.fandom.com/wiki/Planet_{i}",
+        "name": f"Planet {i}",
+        "system": f"System {i % 100}",
+        "region": maybe_none(rng, rng.choice(("Core Worlds", "Mid Rim", "Outer Rim Territories"))),
+        "sector": maybe_none(rng, f"Sector {i % 40}"),
+        "suns": maybe_none(rng, str(rng.randint(1, 3))),
+        "moons": maybe_none(rng, str(rng.randint(0, 5))),
+        "orbital_period": maybe_none(rng, f"{rng.randint(100, 600)}.{rng.randint(0, 9)}"),
+        "diameter": maybe_none(rng, f"{rng.randint(1, 20)},{rng.randint(100, 999)}"),
+        "gravity": maybe_none(rng, f"{rng.choice(('1', '0.9', '1.1'))} standard"),
+        "atmosphere": maybe_none(rng, "Type I (breathable)"),
+        "climate": maybe_none(rng, rng.choice(("arid", "temperate", "frozen, temperate"))),
+        "terrain": maybe_none(rng, rng.choice(("desert", "grassy hills, swamps", "forests"))),
+        "population": maybe_none(rng, f"{rng.randint(1, 999)},000,000"),
+    }
+
+
+def make_starship(rng, i):
+    """Returns a synthetic Wookieepedia starship as read from data-wookieepedia_starships.csv.
+
+    Parameters:
+        rng (random.Random): random number generator
+        i (int): record number
+
+    Returns:
+        dict: starship
+    """
+
+    return {
+        "url": f"https://starwars.fandom.com/wiki/Starship_{i}",
+        "name": f"Starship {i}",
+        "model": f"Model {i % 30}",
+        "starship_class": maybe_none(rng, rng.choice(("Starfighter", "Freighter", "Corvette"))),
+        "manufacturer": maybe_none(rng, rng.choice(("Kuat Drive Yards", "Incom Corporation"))),
+        "length": maybe_none(rng, f"{rng.randint(5, 1600)}.{rng.randint(0, 9)}"),
+        "hyperdrive_rating": maybe_none(rng, f"{rng.randint(1, 4)}.0"),
+        "MGLT": maybe_none(rng, str(rng.randint(40, 120))),
+        "max_atmosphering_speed": f"{rng.randint(1, 9)},{rng.randint(100, 999)}",
+        "crew": maybe_none(rng, str(rng.randint(1, 9))),
+        "passengers": maybe_none(rng, str(rng.randint(0, 600))),
+        "cargo_capacity": maybe_none(rng, f"{rng.randint(1, 9)},000"),
+        "consumables": maybe_none(rng, "1 month"),
+        "armament": maybe_none(rng, "Laser cannons,Ion cannons"),
+    }
+
+
+def run_benchmarks(scales, seed, keys, base_sizes):
+    """Generates synthetic datasets at each of the passed in < scales > and benchmarks the
+    < last_assignment > hot paths against them.
+
+    Parameters:
+        scales (list): data size multipliers
+        seed (int): random number generator seed
+        keys (dict): key mappings
+        base_sizes (dict): dataset and 1x record count key-value pairs
+
+    Returns:
+        list: benchmark results
+    """
+
+    makers = {
+        "planets": make_planet,
+        "starships": make_starship,
+        "people": make_person,
+        "droids": make_droid,
+        "episodes": make_episode,
+        "articles": make_article,
+    }  # generated in this order irrespective of the order of < base_sizes >
+
+    results = []
+    for scale in scales:
+        rng = random.Random(seed)
+        data = {
+            dataset: [make(rng, i) for i in range(base_sizes[dataset] * scale)]
+            for dataset, make in makers.items()
+        }
+
+        results.extend(
+            [
+                benchmark(
+                    "transform_planet",
+                    scale,
+                    len(data["planets"]),
+                    transform_all,
+                    data["planets"],
+                    la.transform_planet,
+                    keys,
+                ),
+                benchmark(
+                    "transform_starship",
+                    scale,
+                    len(data["starships"]),
+                    transform_all,
+                    data["starships"],
+                    la.transform_starship,
+                    keys,
+                ),
+                benchmark(
+                    "transform_sentient_being (person)",
+                    scale,
+                    len(data["people"]),
+                    lambda records: transform_all(
+                        records, la.transform_sentient_being, keys, homeworlds={}
+                    ),
+                    data["people"],
+                ),
+                benchmark(
+                    "transform_sentient_being (droid)",
+                    scale,
+                    len(data["droids"]),
+                    lambda records: transform_all(
+                        records, la.transform_sentient_being, keys, is_droid=True, homeworlds={}
+                    ),
+                    data["droids"],
+                ),
+                benchmark(
+                    "convert_episode_values",
+                    scale,
+                    len(data["episodes"]),
+                    la.convert_episode_values,
+                    data["episodes"],
+                    la.NONE_VALUES,
+                ),
+                benchmark(
+                    "get_news_desks + group_articles_by_news_desk",
+                    scale,
+                    len(data["articles"]),
+                    lambda articles: la.group_articles_by_news_desk(
+                        la.get_news_desks(articles, la.NONE_VALUES), articles
+                    ),
+                    data["articles"],
+                ),
+                benchmark(
+                    "group_articles_by_news_desk_single_pass",
+                    scale,
+                    len(data["articles"]),
+                    la.group_articles_by_news_desk_single_pass,
+                    data["articles"],
+                    la.NONE_VALUES,
+                ),
+            ]
+        )
+
+    return results
+
+
+def stub_swapi_cache(cache_filepath):
+    """Replaces < la.cache > with a new in-memory cache holding SWAPI planet and species
+    entries for every homeworld and species URL minted by < make_person() > and
+    < make_droid() > so that < la.transform_sentient_being() > is benchmarked without remote
+    calls. < la.CACHE_FILEPATH > is pointed at < cache_filepath > so that a cache miss never
+    writes the synthetic entries to the user's cache file.
+
+    Parameters:
+        cache_filepath (str): path to a scratch cache file
+
+    Returns:
+        None
+    """
+
+    la.cache = {}
+    la.CACHE_FILEPATH = cache_filepath
+    for i in range(1, 11):
+        url = f"{la.SWAPI_PLANETS}{i}/"
+        la.cache[utl.create_cache_key(url, None)] = {
+            "name": f"Planet {i}",
+            "url": url,
+            "diameter": "10465",
+            "climate": "arid",
+            "terrain": "desert",
+            "population": "200000",
+        }
+    for i in range(1, 6):
+        url = f"{la.SWAPI_SPECIES}{i}/"
+        la.cache[utl.create_cache_key(url, None)] = {"name": f"Species {i}", "url": url}
+
+
+def transform_all(records, transform, keys, **kwargs):
+    """Calls < transform > for each of the passed in < records >.
+
+    Parameters:
+        records (list): source records
+        transform (function): la.transform_* function
+        keys (dict): old key to new key mappings
+        kwargs (dict): additional keyword arguments passed to < transform >
+
+    Returns:
+        list: transformed records
+    """
+
+    return [transform(record, keys, la.NONE_VALUES, **kwargs) for record in records]
+
+
+def main():
+    """Entry point for program. Generates synthetic datasets at each requested scale,
+    benchmarks the < last_assignment > hot paths, and prints (or writes) the results.
+
+    Parameters:
+        None
+
+    Returns:
+        None
+    """
+
+    parser = argparse.ArgumentParser(description="Benchmark the last_assignment transforms.")
+    parser.add_argument("--scales", type=int, nargs="+", default=SCALES)
+    parser.add_argument("--seed", type=int, default=SEED)
+    parser.add_argument("--json", help="optional path to write the results as JSON")
+    args = parser.parse_args()
+
+    keys = utl.read_json(KEYS_FILEPATH) if Path(KEYS_FILEPATH).exists() else SYNTHETIC_KEYS
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        stub_swapi_cache(os.path.join(cache_dir, "CACHE.json"))
+        results = run_benchmarks(args.scales, args.seed, keys, get_base_sizes())
+
+    columns = ("benchmark", "scale", "rows", "rows_per_s", "peak_mem_kb")
+    print(f"{columns[0]:<46}" + "".join(f"{column:>14}" for column in columns[1:]))
+    for result in results:
+        print(f"{result['benchmark']:<46}" + "".join(f"{result[column]:>14}" for column in columns[1:]))
+
+    if args.json:
+        la.write_json_atomic(args.json, results)
+
+
+if __name__ == "__main__":
+    main()
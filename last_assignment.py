@@ -1,22 +1,384 @@
+import bisect
+import contextlib
 import copy
+import csv
+import functools
+import gzip
+import hashlib
+import heapq
+import json
+import os
 import pathlib
+import pickle
+import re
+import sys
+import time
+import tracemalloc
+import unicodedata
 import five_oh_six_utils as utl
 
-from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait
+from itertools import islice, repeat
 
 
 # Constants
+CACHE_BUNDLE_VERSION = 1
+CATEGORICAL_KEYS = {
+    "planet": ("region", "sector", "climate", "terrain"),
+    "starship": ("starship_class", "manufacturer"),
+    "droid": ("manufacturer", "equipment"),
+}
 CACHE_FILEPATH = "./CACHE.json"
+CONVERTER_CACHE_SIZE = 4096
+EPISODE_COLUMN_TYPES = {
+    "series_season_num": int,
+    "series_episode_num": int,
+    "season_episode_num": int,
+    "episode_prod_code": float,
+    "episode_us_viewers_mm": float,
+    "episode_writers": list,
+}
 NONE_VALUES = ("", "n/a", "none", "unknown")
+JSON_CHUNK_SIZE = 65536
+JSON_WRITER_WORKERS = 4
+NUMBER_PATTERN = re.compile(r"[+-]?\d[\d,]*(\.\d+)?")
+PARALLEL_CHUNK_SIZE = 5000
+PROFILE = os.environ.get("LAST_ASSIGNMENT_PROFILE", "")  # "1" (print) or a .json filepath
+REFERENCE_SNAPSHOT_FILEPATH = "./data-reference_snapshot.pickle"
+REFERENCE_SNAPSHOT_HEADER_SIZE = 65536  # maximum bytes read for the JSON fingerprint header
+REFERENCE_SNAPSHOT_VERSION = 3  # bump whenever the snapshot layout changes
+REFERENCE_SOURCES = {
+    "keys": "data-key_mappings.json",
+    "jedi": "data-jedi.json",
+    "clone_wars_episodes": "data-clone_wars_episodes.csv",
+    "articles": "data-nyt_star_wars_articles.json",
+    "wookiee_planets": "data-wookieepedia_planets.csv",
+    "wookiee_starships": "data-wookieepedia_starships.csv",
+    "wookiee_people": "data-wookieepedia_people.json",
+    "wookiee_droids": "data-wookieepedia_droids.json",
+}
 SWAPI_ENDPOINT = "https://swapi.py4e.com/api"
+SWAPI_GRAPH_CATEGORIES = ("films", "people", "planets", "species", "starships")
 SWAPI_PEOPLE = f"{SWAPI_ENDPOINT}/people/"
 SWAPI_PLANETS = f"{SWAPI_ENDPOINT}/planets/"
 SWAPI_SPECIES = f"{SWAPI_ENDPOINT}/species/"
 SWAPI_STARSHIPS = f"{SWAPI_ENDPOINT}/starships/"
+YEAR_ERA_PATTERN = re.compile(r"(\d+)(BBY|ABY)")
 
 # Create/retrieve cache
 cache = utl.create_cache(CACHE_FILEPATH)
 
+# SWAPI resource requests (see get_swapi_resource)
+swapi_calls = {"cache": 0, "remote": 0}
+
+# Per-stage measurements recorded when profiling is enabled (see profile_stage)
+stage_profiles = []
+
+# Compiled transform plans (see get_transform_plan)
+transform_plans = {}
+
+# Record types generated from key mappings (see get_record_type)
+record_types = {}
+
+# Transform arguments shipped to each worker process (see init_transform_worker)
+worker_state = {}
+
+
+class IndexedCollection(list):
+    """A list of nested dictionaries that builds a hash index per key the first time the key
+    is used in a lookup. Subsequent < get_nested_dict() > calls for the same key are a single
+    dictionary lookup rather than a linear scan. Any mutation of the list itself (e.g.,
+    < append() >, < sort() >, item assignment) discards the indexes; they are rebuilt lazily on
+    the next lookup.
+
+    WARN: changes made to a nested dictionary held by the collection (e.g.,
+    < collection[0]["name"] = "Naboo" >) are not detected. Call < invalidate() > after editing
+    nested dictionaries in place; otherwise lookups may return stale results.
+    """
+
+    def __init__(self, iterable=()):
+        super().__init__(iterable)
+        self._indexes = {}
+
+    def get_nested_dict(self, key, value):
+        """Returns the first nested dictionary whose < key > value equals the passed in
+        < value >. Returns None if no match is found. Falls back to delegating to the function
+        < utl.get_nested_dict > if the key's values (or < value >) are not hashable.
+
+        Parameters:
+            key (str): key to match on
+            value (obj): value to match
+
+        Returns:
+            dict|None: matching nested dictionary
+        """
+
+        index = self._indexes.get(key)
+        if index is None:
+            index = {}
+            try:
+                for nested_dict in self:
+                    index.setdefault(nested_dict.get(key), nested_dict)
+            except TypeError:
+                index = False  # unhashable values
+            self._indexes[key] = index
+        if index is False:
+            return utl.get_nested_dict(self, key, value)
+        try:
+            return index.get(value)
+        except TypeError:
+            return utl.get_nested_dict(self, key, value)
+
+    def invalidate(self, key=None):
+        """Discards the index built for < key > (all indexes if < key > is None). Call after
+        editing nested dictionaries in place; the index is rebuilt on the next lookup.
+
+        Parameters:
+            key (str): key whose index is discarded
+
+        Returns:
+            None
+        """
+
+        if key is None:
+            self._indexes.clear()
+        else:
+            self._indexes.pop(key, None)
+
+    def _invalidate(method):
+        def wrapper(self, *args, **kwargs):
+            self._indexes.clear()
+            return method(self, *args, **kwargs)
+
+        return wrapper
+
+    append = _invalidate(list.append)
+    clear = _invalidate(list.clear)
+    extend = _invalidate(list.extend)
+    insert = _invalidate(list.insert)
+    pop = _invalidate(list.pop)
+    remove = _invalidate(list.remove)
+    reverse = _invalidate(list.reverse)
+    sort = _invalidate(list.sort)
+    __delitem__ = _invalidate(list.__delitem__)
+    __iadd__ = _invalidate(list.__iadd__)
+    __imul__ = _invalidate(list.__imul__)
+    __setitem__ = _invalidate(list.__setitem__)
+    del _invalidate
+
+
+class JsonWriter:
+    """Queues JSON serialization and disk writes to a background thread pool so that file
+    output overlaps with computation. Each file is published atomically by delegating to the
+    function < write_json_atomic() >; a crash never leaves a half-written file behind. Call
+    < flush() > (or < close() >) to wait for every queued write to complete; the first error
+    raised by a queued write is re-raised there.
+
+    WARN: By default < write() > queues a deep copy of the data so that the caller may continue
+    to mutate its objects (e.g., r2_d2["instructions"]) while the write is pending.
+    """
+
+    def __init__(self, max_workers=JSON_WRITER_WORKERS, encoding="utf-8", indent=2):
+        self.encoding = encoding
+        self.indent = indent
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._futures = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """Waits for queued writes to complete and shuts down the thread pool.
+
+        Parameters:
+            None
+
+        Returns:
+            None
+        """
+
+        try:
+            self.flush()
+        finally:
+            self._executor.shutdown()
+
+    def flush(self):
+        """Flush barrier. Waits for every queued write to complete.
+
+        Parameters:
+            None
+
+        Returns:
+            None
+        """
+
+        futures, self._futures = self._futures, []
+        wait(futures)
+        for future in futures:
+            future.result()  # re-raise the first error
+
+    def write(self, filepath, data, snapshot=True):
+        """Queues < data > to be serialized as JSON and written to < filepath >.
+
+        Parameters:
+            filepath (str): the path to the file
+            data (dict)/(list): the data to be encoded as JSON and written to the file
+            snapshot (bool): queue a deep copy of < data > rather than < data > itself
+
+        Returns:
+            None
+        """
+
+        if snapshot:
+            data = copy.deepcopy(data)
+        future = self._executor.submit(
+            write_json_atomic, filepath, data, self.encoding, self.indent
+        )
+        self._futures.append(future)
+
+
+class Record:
+    """Base class of the compact record types generated by < get_record_type() >. Each record
+    type declares its new key names as __slots__ so instances carry no per-instance
+    dictionary. Records support read/write dictionary-style access (record["name"],
+    record.get("name"), keys(), values(), items()) and compare equal to dictionaries with the
+    same key-value pairs. Use < encode_record() > as the json.dump() default function.
+    """
+
+    __slots__ = ()
+    entity_type = None
+
+    def __init__(self, *values):
+        for field, value in zip(self.__slots__, values):
+            setattr(self, field, value)
+
+    def __contains__(self, key):
+        return key in self.__slots__
+
+    def __eq__(self, other):
+        if isinstance(other, (Record, dict)):
+            return self.to_dict() == dict(other.items())
+        return NotImplemented
+
+    __hash__ = None
+
+    def __getitem__(self, key):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self):
+        return iter(self.__slots__)
+
+    def __len__(self):
+        return len(self.__slots__)
+
+    def __reduce__(self):
+        return make_record, (self.entity_type, self.__slots__, tuple(self.values()))
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+    def __setitem__(self, key, value):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def get(self, key, default=None):
+        return getattr(self, key, default) if key in self.__slots__ else default
+
+    def items(self):
+        return zip(self.__slots__, self.values())
+
+    def keys(self):
+        return self.__slots__
+
+    def to_dict(self):
+        return dict(self.items())
+
+    def values(self):
+        return [getattr(self, field) for field in self.__slots__]
+
+
+class SortedViews:
+    """Maintains multiple orderings (views) of a single collection of records (e.g., the
+    transformed planets) without copying or re-sorting the collection. Each view is an index
+    permutation: a sorted list of (< sort key >, < index >) entries that point into the
+    < records > list. New records are inserted into every view with a binary search.
+    Equal sort keys retain insertion order (as with a stable sort) in both ascending and
+    descending (reverse) views.
+    """
+
+    def __init__(self, records=()):
+        self.records = list(records)
+        self._views = {}  # name -> (key, reverse, entries)
+
+    def __len__(self):
+        return len(self.records)
+
+    def add_view(self, name, key, reverse=False):
+        """Adds a view named < name > ordered by the value returned by the passed in < key >
+        function. The collection is sorted once; subsequent insertions maintain the order.
+
+        Parameters:
+            name (str): view name
+            key (function): returns the value to order a record by
+            reverse (bool): order records in descending order
+
+        Returns:
+            None
+        """
+
+        sign = -1 if reverse else 1
+        entries = sorted((key(record), sign * i) for i, record in enumerate(self.records))
+        self._views[name] = (key, reverse, entries)
+
+    def insert(self, record):
+        """Adds the passed in < record > to the collection and to every view.
+
+        Parameters:
+            record (dict): record to add
+
+        Returns:
+            None
+        """
+
+        i = len(self.records)
+        self.records.append(record)
+        for key, reverse, entries in self._views.values():
+            bisect.insort(entries, (key(record), -i if reverse else i))
+
+    def iter_view(self, name):
+        """Returns an iterator that yields the records in < name > view order.
+
+        Parameters:
+            name (str): view name
+
+        Returns:
+            iterator: records in view order
+        """
+
+        key, reverse, entries = self._views[name]
+        if reverse:
+            return (self.records[-i] for sort_key, i in reversed(entries))
+        return (self.records[i] for sort_key, i in entries)
+
+    def top(self, name, k=None):
+        """Returns the first < k > records (all records if None) in < name > view order.
+
+        Parameters:
+            name (str): view name
+            k (int): number of records to return
+
+        Returns:
+            list: records in view order
+        """
+
+        return list(islice(self.iter_view(name), k))
+
 
 def board_ship(ship, crew_members, crew_positions, passengers=None):
     """Assigns < crew_members > and < passengers > to a starship. Crew size and passenger capacity
@@ -54,17 +416,213 @@ def board_ship(ship, crew_members, crew_positions, passengers=None):
     return ship
 
 
-def convert_episode_values(episodes, none_values):
+def board_fleet(ships, crew_members, crew_positions, passengers=None, priority=None):
+    """Bulk version of < board_ship() > that assigns a pool of < crew_members > and a pool of
+    < passengers > across a fleet of < ships > (e.g., thousands of transformed starships). Ships
+    are boarded in order. Each ship receives the next "crew_size" crew members (paired with
+    < crew_positions > by index position) and, if < passengers > are provided, the next
+    "max_passengers" passengers. A ship with a "crew_size" or "max_passengers" value of None
+    boards no one.
+
+    Each pool is drawn from a queue. If a < priority > function is provided the queues are
+    priority queues (heaps) that yield the crew member or passenger with the lowest
+    < priority > value first (ties in pool order); otherwise the pools are drawn in order.
+    Members are drawn one at a time so no per-ship slices of the pools are copied.
+
+    The ships are mutated in place (as with < board_ship() >). A compact manifest is returned
+    to the caller:
+
+    {
+        "ships": [(< ship name >, < number of crew >, < number of passengers >), ...],
+        "unassigned_crew": [< crew member >, ...],
+        "unassigned_passengers": [< passenger >, ...]
+    }
+
+    Parameters:
+        ships (list): starships
+        crew_members (iterable): crew members seeking assignment
+        crew_positions (tuple): crew positions (e.g., 'pilot', 'copilot', etc.)
+        passengers (iterable): passengers seeking permission to board
+        priority (function): optional function that returns a crew member's or passenger's
+                             priority (lower values board first)
+
+    Returns:
+        dict: manifest
+    """
+
+    def queue(pool):
+        if not priority:
+            return iter(pool)
+        heap = [(priority(member), i, member) for i, member in enumerate(pool)]
+        heapq.heapify(heap)
+        return (heapq.heappop(heap)[2] for i in range(len(heap)))
+
+    crew_queue = queue(crew_members)
+    passenger_queue = queue(passengers) if passengers else None
+    manifest = {"ships": [], "unassigned_crew": [], "unassigned_passengers": []}
+
+    for ship in ships:
+        # zip() stops at the last position before drawing another crew member
+        positions = islice(crew_positions, ship.get("crew_size") or 0)
+        ship["crew_members"] = dict(zip(positions, crew_queue))
+        if passenger_queue:
+            seats = ship.get("max_passengers") or 0
+            ship["passengers_on_board"] = list(islice(passenger_queue, seats))
+        manifest["ships"].append(
+            (
+                ship.get("name"),
+                len(ship["crew_members"]),
+                len(ship["passengers_on_board"]) if passenger_queue else 0,
+            )
+        )
+
+    manifest["unassigned_crew"].extend(crew_queue)
+    if passenger_queue:
+        manifest["unassigned_passengers"].extend(passenger_queue)
+
+    return manifest
+
+
+def build_swapi_graph(resources):
+    """Returns an in-memory graph of SWAPI films, people, planets, species, and starships
+    built from the passed in < resources >, typically the values of the local < cache >.
+    Each resource is either a single SWAPI entity or a search "envelope" whose entities
+    are found in its ['results'] list. No remote calls are made.
+
+    The graph is a dictionary structured as follows:
+
+    {
+        "entities": {< url >: {< entity >}, ...},
+        "names": {(< category >, < name or title >): < url >, ...},
+        "adjacency": {< url >: {< category >: {< url >: None, ...}, ...}, ...}
+    }
+
+    Every SWAPI URL (or list of URLs) referenced by an entity is recorded as an edge in
+    both directions. Edges are grouped by the category of the entity at the other end
+    (e.g., "starships") so a film's starships and a planet's people (its residents) can be
+    accessed without scanning the graph. Delegates to the function < get_swapi_category >
+    the task of extracting the category from a URL. Only categories listed in
+    < SWAPI_GRAPH_CATEGORIES > are included.
+
+    Parameters:
+        resources (iterable): SWAPI entities and/or search envelopes
+
+    Returns:
+        dict: entities, name index, and bidirectional adjacency index
+    """
+
+    graph = {"entities": {}, "names": {}, "adjacency": {}}
+    adjacency = graph["adjacency"]
+
+    for resource in resources:
+        if not isinstance(resource, dict):
+            continue
+        for entity in resource.get("results", [resource]):
+            url = entity.get("url")
+            category = get_swapi_category(url)
+            if category not in SWAPI_GRAPH_CATEGORIES:
+                continue
+            graph["entities"][url] = entity
+            graph["names"][(category, entity.get("name", entity.get("title")))] = url
+
+            for key, value in entity.items():
+                if key == "url":
+                    continue
+                for related_url in value if isinstance(value, list) else [value]:
+                    related_category = get_swapi_category(related_url)
+                    if related_category in SWAPI_GRAPH_CATEGORIES:
+                        # Record the edge in both directions
+                        adjacency.setdefault(url, {}).setdefault(related_category, {})[related_url] = None
+                        adjacency.setdefault(related_url, {}).setdefault(category, {})[url] = None
+
+    return graph
+
+
+def build_reference_snapshot(
+    filepath=REFERENCE_SNAPSHOT_FILEPATH, sources=REFERENCE_SOURCES, none_values=NONE_VALUES
+):
+    """Parses the static reference data < sources >, applies the value conversions performed
+    by < main() > (converted Clone Wars episodes; Wookieepedia planets transformed with
+    < transform_columns() >), and writes the result to < filepath >. The snapshot file begins
+    with a single line of JSON holding the fingerprint returned by
+    < get_reference_fingerprint() > followed by the pickled data, so that a reader can reject a
+    stale or foreign snapshot before unpickling anything (see < load_reference_snapshot() >).
+    The snapshot is written to a temporary file and renamed with < os.replace() > so that
+    readers never observe a partially written snapshot.
+
+    The returned dictionary is structured as follows:
+
+    {
+        "keys": < key mappings >,
+        "jedi": < Jedi >,
+        "clone_wars_episodes_raw": < episodes (unconverted) >,
+        "clone_wars_episodes": < converted episodes >,
+        "articles": < NYT articles >,
+        "wookiee_planets": < Wookieepedia planets >,
+        "planets": < transformed Wookieepedia planets >,
+        "wookiee_starships": < Wookieepedia starships >,
+        "wookiee_people": < Wookieepedia people >,
+        "wookiee_droids": < Wookieepedia droids >
+    }
+
+    Parameters:
+        filepath (str): path to the snapshot file
+        sources (dict): dataset name and source file path key-value pairs
+        none_values (tuple): strings to test and convert to None
+
+    Returns:
+        dict: parsed and converted reference data
+    """
+
+    data = {
+        "keys": utl.read_json(sources["keys"]),
+        "jedi": utl.read_json(sources["jedi"]),
+        "clone_wars_episodes_raw": utl.read_csv_to_dicts(sources["clone_wars_episodes"]),
+        "articles": utl.read_json(sources["articles"]),
+        "wookiee_planets": utl.read_csv_to_dicts(sources["wookiee_planets"]),
+        "wookiee_starships": utl.read_csv_to_dicts(sources["wookiee_starships"]),
+        "wookiee_people": utl.read_json(sources["wookiee_people"]),
+        "wookiee_droids": utl.read_json(sources["wookiee_droids"]),
+    }
+    data["clone_wars_episodes"] = convert_episode_values(
+        copy.deepcopy(data["clone_wars_episodes_raw"]), none_values
+    )
+    data["planets"] = transform_columns(
+        read_csv_to_columns(sources["wookiee_planets"]), data["keys"], "planet", none_values
+    )
+
+    header = json.dumps(get_reference_fingerprint(sources, none_values), separators=(",", ":"))
+    fd, tmp_filepath = create_temp_file(filepath, ".pickle")
+    try:
+        with open(fd, "wb") as file_obj:
+            file_obj.write(header.encode("utf-8") + b"\n")
+            pickle.dump(data, file_obj, protocol=pickle.HIGHEST_PROTOCOL)
+            file_obj.flush()
+            os.fsync(file_obj.fileno())
+        set_file_mode(tmp_filepath, filepath)
+        os.replace(tmp_filepath, filepath)
+    except BaseException:
+        os.remove(tmp_filepath)
+        raise
+
+    return data
+
+
+def convert_episode_values(episodes, none_values, converters=None):
     """Converts select string values to either < int >, < float >, < list >, or < None >
     in the passed in list of nested dictionaries. The function delegates to the
     < utl.to_*() > functions the task of converting the specified strings to either
     an integer, float, list, or None.
 
-    If a value is a member of < none_values > the value is replaced by < None >. Otherwise,
-    various < utl.to_*() > functions are called as necessary in an attempt to convert
-    certain episode values to more appropriate types per the "Type conversions" listed below.
+    If a value in any column is a member of < none_values > the value is replaced by < None >.
+    Otherwise, the value is converted by the column's converter (if any). If the caller does
+    not pass in < converters > only the columns listed in < EPISODE_COLUMN_TYPES > (see "Type
+    conversions" below) are converted; values in other columns remain strings. Callers may
+    pass in a plan derived by < infer_column_converters() > to convert every numeric column.
+    The plan is applied column by column so each column requires a single converter dispatch
+    rather than repeated key membership tests per value.
 
-    Type conversions:
+    Type conversions (data-clone_wars_episodes.csv):
         series_season_num (str) -> series_season_num (int | None)
         series_episode_num (str) -> series_episode_num (int | None)
         season_episode_num (str) -> season_episode_num (int | None)
@@ -75,204 +633,1197 @@ def convert_episode_values(episodes, none_values):
     Parameters:
         episodes (list): nested episode dictionaries
         none_values (tuple): strings to convert to None
+        converters (dict): optional column and converter (or None) key-value pairs
+
+    Returns:
+        list: nested episode dictionaries containing mutated key-value pairs
+    """
+
+    if converters is None:
+        converters = infer_column_converters(episodes, none_values, EPISODE_COLUMN_TYPES, 0)
+
+    columns = {key: converters.get(key) for episode in episodes for key in episode}
+    for key, convert in columns.items():
+        for episode in episodes:
+            if key not in episode:
+                continue
+            value = episode[key]
+            if value in none_values:
+                episode[key] = None
+            elif convert:
+                episode[key] = convert(value)
+
+    return episodes
+
+
+def create_temp_file(filepath, suffix=""):
+    """Creates and opens a uniquely named temporary file in the directory of < filepath > for
+    an atomic write (see < write_json_atomic() >). Unlike < tempfile.mkstemp() >, which
+    creates files readable by the owner only (0600), the file is created with mode 0666 and
+    the operating system applies the process umask, exactly as < open() > does for new files.
+
+    Parameters:
+        filepath (str): the path to the destination file
+        suffix (str): temporary file name suffix (e.g., ".json")
+
+    Returns:
+        tuple: (< file descriptor >, < temporary file path >)
+    """
+
+    directory = os.path.dirname(os.path.abspath(filepath))
+    flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0)
+    while True:
+        tmp_filepath = os.path.join(directory, f".tmp-{os.urandom(6).hex()}{suffix}")
+        try:
+            return os.open(tmp_filepath, flags, 0o666), tmp_filepath
+        except FileExistsError:
+            continue
+
+
+def decode_categories(records, categories):
+    """Reverses < encode_categories() >. Replaces each integer code (or tuple of codes) stored
+    in the passed in < records > with the value (or list of values) it represents. Records are
+    mutated in place.
+
+    Parameters:
+        records (list): dictionaries or < Record > instances containing encoded values
+        categories (dict): key and distinct values key-value pairs
+
+    Returns:
+        list: records containing decoded values
+    """
+
+    for record in records:
+        for key, values in categories.items():
+            code = record.get(key)
+            if isinstance(code, tuple):
+                record[key] = [values[i] for i in code]
+            elif code is not None:
+                record[key] = values[code]
+
+    return records
+
+
+def encode_categories(records, keys):
+    """Dictionary-encodes the values of the passed in low-cardinality < keys > (e.g., "climate",
+    "terrain", "starship_class") found in < records >. Each distinct value is stored once in a
+    per-key list and each record value is replaced by the value's integer index in that list
+    (its "code"). List values (e.g., ["arid", "temperate"]) are replaced by a tuple of codes.
+    None values are left as is. Records are mutated in place.
+
+    The per-key lists of distinct values are returned to the caller and are required to
+    filter records with < filter_by_category() > or to restore the original values with
+    < decode_categories() > before writing records to the file system.
+
+    Parameters:
+        records (list): dictionaries or < Record > instances
+        keys (tuple): keys whose values are to be encoded
+
+    Returns:
+        dict: key and distinct values key-value pairs
+    """
+
+    codes = {key: {} for key in keys}
+
+    for record in records:
+        for key, key_codes in codes.items():
+            value = record.get(key)
+            if isinstance(value, list):
+                record[key] = tuple(key_codes.setdefault(item, len(key_codes)) for item in value)
+            elif value is not None:
+                record[key] = key_codes.setdefault(value, len(key_codes))
+
+    return {key: list(key_codes) for key, key_codes in codes.items()}
+
+
+def encode_record(obj):
+    """Default function passed to json.dump() or json.dumps() in order to serialize
+    < Record > instances as JSON objects.
+
+    Example:
+    json.dump(planets, file_obj, default=encode_record)
+
+    Parameters:
+        obj (Record): record that the json module cannot serialize natively
+
+    Returns:
+        dict: dictionary representation of the record
+    """
+
+    if isinstance(obj, Record):
+        return obj.to_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def export_cache(filepath, resource_types=None):
+    """Exports the local < cache > (or a subset of it) to a single gzip-compressed JSON bundle
+    that can be shipped to other machines and merged into their caches with < import_cache >.
+    If < resource_types > are provided (e.g., ("people", "planets")) only those cache entries
+    whose key targets one of the resource types are exported. Delegates to the function
+    < get_cache_key_category > the task of identifying each entry's resource type.
+
+    The bundle is structured as follows:
+
+    {
+        "version": < CACHE_BUNDLE_VERSION >,
+        "checksum": < SHA-256 hex digest of the canonically encoded entries >,
+        "count": < number of entries >,
+        "entries": {< cache key >: < resource >, ...}
+    }
+
+    Parameters:
+        filepath (str): path to the bundle file (e.g., "swapi_cache.json.gz")
+        resource_types (tuple): optional SWAPI resource types to export
+
+    Returns:
+        int: number of cache entries exported
+    """
+
+    entries = {
+        key: value
+        for key, value in cache.items()
+        if not resource_types or get_cache_key_category(key) in resource_types
+    }
+    bundle = {
+        "version": CACHE_BUNDLE_VERSION,
+        "checksum": get_cache_checksum(entries),
+        "count": len(entries),
+        "entries": entries,
+    }
+    with gzip.open(filepath, "wt", encoding="utf-8") as file_obj:
+        json.dump(bundle, file_obj, ensure_ascii=False)
+
+    return len(entries)
+
+
+def filter_by_category(records, key, value, categories):
+    """Returns the < records > whose dictionary-encoded < key > value equals the passed in
+    < value > (or, for list values, includes it). The < value > is translated to its integer
+    code once so that each record is tested with an integer comparison rather than a string
+    comparison. See < encode_categories() >.
+
+    Parameters:
+        records (list): records containing encoded values
+        key (str): encoded key to filter on
+        value (str): value to match
+        categories (dict): key and distinct values key-value pairs
+
+    Returns:
+        list: matching records
+    """
+
+    try:
+        code = categories[key].index(value)
+    except ValueError:
+        return []
+
+    matches = []
+    for record in records:
+        record_code = record.get(key)
+        if record_code == code or (isinstance(record_code, tuple) and code in record_code):
+            matches.append(record)
+
+    return matches
+
+
+def get_cache_checksum(entries):
+    """Returns a SHA-256 hex digest of the passed in cache < entries >. The entries are encoded
+    canonically (sorted keys, no whitespace) so that the digest does not depend on key order.
+
+    Parameters:
+        entries (dict): cache key-value pairs
+
+    Returns:
+        str: hex digest
+    """
+
+    encoded = json.dumps(entries, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def get_cache_key_category(key):
+    """Returns the SWAPI resource type (e.g., "people", "starships") targeted by the passed in
+    cache < key >. Returns None if the < key > does not target a SWAPI resource.
+
+    Parameters:
+        key (str): cache key minted by < utl.create_cache_key >
+
+    Returns:
+        str|None: resource type
+    """
+
+    if not key.startswith(SWAPI_ENDPOINT):
+        return None
+    match = re.match(r"/*(\w+)", key[len(SWAPI_ENDPOINT) :])
+    return match.group(1) if match else None
+
+
+def get_file_digest(filepath, chunk_size=JSON_CHUNK_SIZE):
+    """Returns a SHA-256 hex digest of the contents of the file located at < filepath >. The
+    file is read in binary chunks of < chunk_size > bytes.
+
+    Parameters:
+        filepath (str): the path to the file
+        chunk_size (int): number of bytes read per chunk
+
+    Returns:
+        str: hex digest
+    """
+
+    digest = hashlib.sha256()
+    with open(filepath, "rb") as file_obj:
+        for chunk in iter(functools.partial(file_obj.read, chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def get_most_viewed_episode(episodes):
+    """Identifies and returns a list of one or more episodes with the highest recorded
+    viewership. Ignores episodes with no viewship value. Includes in the list only those
+    episodes that tie for the highest recorded viewership. If no ties exist only one
+    episode will be returned in the list. Delegates to the function < has_viewer_data >
+    the task of determining if the episode includes viewership "episode_us_viewers_mm"
+    numeric data and to the function < rank_episodes > the task of ranking the episodes.
+
+    Parameters:
+        episodes (list): nested episode dictionaries
+
+    Returns:
+        list: episode(s) with the highest recorded viewership.
+    """
+
+    return rank_episodes(
+        episodes,
+        lambda episode: float(episode["episode_us_viewers_mm"]) if has_viewer_data(episode) else None,
+    )
+
+
+def get_nested_dict(data, key, value):
+    """Returns the first nested dictionary in < data > whose < key > value equals the passed
+    in < value >. If < data > is an < IndexedCollection > the lookup is served by its hash index;
+    otherwise the task is delegated to the function < utl.get_nested_dict >.
+
+    Parameters:
+        data (list): nested dictionaries
+        key (str): key to match on
+        value (obj): value to match
+
+    Returns:
+        dict|None: matching nested dictionary
+    """
+
+    if isinstance(data, IndexedCollection):
+        return data.get_nested_dict(key, value)
+    return utl.get_nested_dict(data, key, value)
+
+
+def get_news_desks(articles, none_values):
+    """Returns a list of New York Times news desks sourced from the passed in
+    < articles > list. Accesses the news desk name from each article's "news_desk"
+    key-value pair. Filters out duplicates in order to guarantee uniqueness. The
+    list sorted alphanumerically before being returned to the caller.
+
+    Delegates to the function < utl.to_none > the task of converting "news_desk"
+    values that equal "None" (a string) to None. Only news_desk values that are "truthy"
+    (i.e., not None) are returned in the list.
+
+    Parameters:
+        articles (list): nested dictionary representations of New York Times articles
+        none_values (tuple): strings to convert to None
+
+    Returns:
+        list: news desk strings (no duplicates) sorted alphanumerically
+    """
+    news_desks = set()
+    for article in articles:
+        news_desk = utl.to_none(article.get("news_desk"), none_values)
+        if news_desk:  # Check for truthiness; the set guarantees uniqueness
+            news_desks.add(news_desk)
+
+    return sorted(news_desks)
+
+
+def get_reference_data(filepath=REFERENCE_SNAPSHOT_FILEPATH, rebuild=False):
+    """Returns the parsed and converted static reference data. Delegates to the function
+    < load_reference_snapshot > the task of loading the snapshot located at < filepath >. If
+    the snapshot is missing or stale (or < rebuild > is True) delegates to the function
+    < build_reference_snapshot > the task of re-parsing the source files and writing a fresh
+    snapshot.
+
+    Parameters:
+        filepath (str): path to the snapshot file
+        rebuild (bool): ignore any existing snapshot
+
+    Returns:
+        dict: parsed and converted reference data
+    """
+
+    data = None if rebuild else load_reference_snapshot(filepath)
+    if data is None:
+        data = build_reference_snapshot(filepath)
+    return data
+
+
+def get_reference_fingerprint(sources=REFERENCE_SOURCES, none_values=NONE_VALUES):
+    """Returns a fingerprint that identifies a reference data snapshot. The fingerprint
+    combines the < REFERENCE_SNAPSHOT_VERSION >, the < none_values > used during conversion,
+    a SHA-256 hex digest of each source file, and a SHA-256 hex digest of this module and of
+    < five_oh_six_utils > (the code that parses and converts the source data). A snapshot is
+    fresh only if its fingerprint equals the current one. The fingerprint is JSON-serializable
+    so that it can be stored as the snapshot's header.
+
+    Parameters:
+        sources (dict): dataset name and source file path key-value pairs
+        none_values (tuple): strings to test and convert to None
+
+    Returns:
+        dict: fingerprint
+    """
+
+    return {
+        "version": REFERENCE_SNAPSHOT_VERSION,
+        "none_values": list(none_values),
+        "sources": {name: get_file_digest(path) for name, path in sources.items()},
+        "code": [get_file_digest(path) for path in (__file__, utl.__file__)],
+    }
+
+
+def get_record_type(entity_type, fields):
+    """Returns the compact < Record > subclass for the passed in < entity_type > whose
+    __slots__ are the passed in < fields > (i.e., the new key names found in
+    < keys[entity_type] >). Record types are generated once and stored in the module-level
+    < record_types > dictionary.
+
+    Parameters:
+        entity_type (str): "planet", "starship", "person", or "droid"
+        fields (tuple): new key names in order
+
+    Returns:
+        type: Record subclass
+    """
+
+    record_type = record_types.get((entity_type, fields))
+    if record_type is None:
+        name = f"{entity_type.title()}Record"
+        record_type = type(name, (Record,), {"__slots__": fields, "entity_type": entity_type})
+        record_types[(entity_type, fields)] = record_type
+
+    return record_type
+
+
+def get_species_name(species):
+    """Retrieves the first species listed in the passed in < species > list of SWAPI URLs
+    by delegating to the function < get_swapi_resource() > and returns its "name" value.
+
+    Parameters:
+        species (list): SWAPI species URLs
+
+    Returns:
+        str|None: species name
+    """
+
+    species_info = get_swapi_resource(species[0])
+    return species_info["name"] if species_info else None
+
+
+def get_swapi_category(url):
+    """Returns the resource category (e.g., "films", "people", "planets") of the passed in
+    SWAPI < url > (e.g., https://swapi.py4e.com/api/planets/8/ -> "planets"). Returns None
+    if the < url > is not a SWAPI entity URL.
+
+    Parameters:
+        url (str): a uniform resource locator that identifies a SWAPI entity
+
+    Returns:
+        str|None: resource category
+    """
+
+    if not isinstance(url, str) or not url.startswith(SWAPI_ENDPOINT):
+        return None
+    segments = url[len(SWAPI_ENDPOINT) :].strip("/").split("/")
+    return segments[0] if len(segments) == 2 else None
+
+
+def get_swapi_resource(url, params=None, timeout=10, verify=True):
+    """Retrieves a deep copy of a SWAPI resource from either the local < cache >
+    dictionary or from a remote API if no local copy exists. Delegates to the function
+    < utl.create_cache_key > the task of minting a key that is used to identify a cached
+    resource. If the desired resource is not located in the cache, delegates to the
+    function < get_resource > the task of retrieving the resource from SWAPI.
+    A deep copy of the resource retrieved remotely is then added to the local < cache > by
+    mapping it to a new < cache[key] >. The mutated cache is written to the file
+    system before a deep copy of the resource is returned to the caller.
+
+    WARN: Deep copying is required to guard against possible mutatation of the cached
+    objects when dictionaries representing SWAPI entities (e.g., films, people, planets,
+    species, starships, and vehicles) are modified by other processes.
+
+    Parameters:
+        url (str): a uniform resource locator that specifies the resource.
+        params (dict): optional dictionary of querystring arguments.
+        timeout (int): timeout value in seconds
+        verify (bool): verify server's TSL certificate
+
+    Returns:
+        dict|list: requested resource sourced from either the local cache or a remote API
+    """
+
+    key = utl.create_cache_key(url, params)
+    if key in cache.keys():
+        swapi_calls["cache"] += 1
+        return copy.deepcopy(cache[key])  # recursive copy of objects
+    else:
+        swapi_calls["remote"] += 1
+        resource = utl.get_resource(url, params, timeout, verify)
+        cache[key] = copy.deepcopy(resource)  # recursive copy of objects
+        utl.write_json(CACHE_FILEPATH, cache)  # persist mutated cache
+        return resource
+
+
+def get_transform_plan(keys, entity_type, none_values):
+    """Returns the compiled transform plan for the passed in < entity_type > ("planet",
+    "starship", "person", or "droid"). A plan is a flat tuple of
+    (< old key >, < new key >, < converter >) tuples, one per key mapping in
+    < keys[entity_type] > and in the same order. Delegates to the function
+    < get_value_converter > the task of selecting each key's converter.
+
+    Plans are compiled once per entity type, key mappings, and < none_values > and stored in
+    the module-level < transform_plans > dictionary keyed by entity type, the identity of the
+    < keys[entity_type] > dictionary, and < none_values > (unhashable containers such as lists
+    are converted to a tuple). Looking up a plan costs a single dictionary lookup per call.
+    The < transform_*() > functions loop over the plan without evaluating per-key conditionals.
+
+    WARN: plans are matched on the identity of the key mappings dictionary, not its contents.
+    Call < transform_plans.clear() > after mutating a key mappings dictionary in place.
+
+    Converters of low-cardinality keys listed in < CATEGORICAL_KEYS > are wrapped by
+    < intern_converter() > so that each distinct string value is stored once.
+
+    Parameters:
+        keys (dict): old key to new key mappings
+        entity_type (str): nested < keys > dictionary to compile
+        none_values (tuple): strings to convert to None (any container)
+
+    Returns:
+        tuple: (old key, new key, converter) tuples
+    """
+
+    mappings = keys[entity_type]
+    plan_key = (entity_type, id(mappings), none_values)
+    try:
+        return transform_plans[plan_key][1]
+    except KeyError:
+        pass
+    except TypeError:
+        none_values = tuple(none_values)  # e.g., a list
+        plan_key = (entity_type, id(mappings), none_values)
+        if plan_key in transform_plans:
+            return transform_plans[plan_key][1]
+
+    plan = []
+    for old_key, new_key in mappings.items():
+        convert = get_value_converter(entity_type, old_key, none_values)
+        if convert and old_key in CATEGORICAL_KEYS.get(entity_type, ()):
+            convert = intern_converter(convert)
+        plan.append((old_key, new_key, convert))
+    plan = tuple(plan)
+    transform_plans[plan_key] = (mappings, plan)  # reference keeps id(mappings) unique
+
+    return plan
+
+
+def get_value_converter(entity_type, key, none_values):
+    """Returns a function that accepts a single < data > value and converts it to the type
+    specified for < key > in the "Mappings" of < transform_planet() >, < transform_starship() >,
+    or < transform_sentient_being() >. Type conversions are delegated to the various
+    < utl.to_*() > functions exactly as the transform functions specify.
+
+    Each converter performs the none value check itself and then calls the < utl.to_*() >
+    function directly. String values are tested inline (stripped and lower-cased, as
+    < utl.to_none() > tests them) so the common case costs a single Python call per value;
+    other values are delegated to < utl.to_none() >. Planet values
+    found in < none_values > skip conversion; starship and sentient being values are checked
+    and converted in the same order as the original transform functions.
+
+    A sentient being's "homeworld" requires additional arguments (see
+    < transform_homeworld() >). None is returned in its place.
+
+    Parameters:
+        entity_type (str): "planet", "starship", "person", or "droid"
+        key (str): < data > key
+        none_values (tuple): strings to convert to None
+
+    Returns:
+        function|None: value converter
+    """
+
+    to_list = utl.to_list
+    to_none = utl.to_none
+
+    def none_only(value):
+        if isinstance(value, str):
+            return None if value.strip().lower() in none_values else value
+        return to_none(value, none_values)
+
+    def none_then(convert):
+        def converter(value):
+            if isinstance(value, str):
+                if value.strip().lower() in none_values:
+                    return None
+                return convert(value)
+            value = to_none(value, none_values)
+            return None if value is None else convert(value)
+
+        return converter
+
+    def none_then_list(delimiter):
+        def converter(value):
+            if isinstance(value, str):
+                if value.strip().lower() in none_values:
+                    return None
+                return to_list(value, delimiter)
+            value = to_none(value, none_values)
+            return None if value is None else to_list(value, delimiter)
+
+        return converter
+
+    def none_into(convert):
+        def converter(value):
+            if isinstance(value, str):
+                if value.strip().lower() in none_values:
+                    value = None
+            else:
+                value = to_none(value, none_values)
+            return convert(value)
+
+        return converter
+
+    def into_none(convert):
+        def converter(value):
+            value = convert(value)
+            if isinstance(value, str):
+                return None if value.strip().lower() in none_values else value
+            return to_none(value, none_values)
+
+        return converter
+
+    if entity_type == "planet":
+        if key in ("suns", "moons", "population", "diameter"):
+            return none_then(utl.to_int)
+        if key == "gravity":
+            return none_then(to_gravity_value_cached)
+        if key == "orbital_period":
+            return none_then(utl.to_float)
+        if key in ("climate", "terrain"):
+            return none_then_list(", ")
+        return none_only
+
+    if entity_type == "starship":
+        convert = {
+            "length": utl.to_float,
+            "hyperdrive_rating": utl.to_float,
+            "max_atmosphering_speed": lambda value: utl.to_int(value.replace(",", "")),
+            "crew": utl.to_int,
+            "passengers": utl.to_int,
+            "cargo_capacity": utl.to_int,
+            "armament": lambda value: utl.to_list(value, ","),
+        }.get(key)
+        return none_into(convert) if convert else none_only
+
+    is_droid = entity_type == "droid"
+    if key in ("url", "name"):
+        return none_only
+    if key in ("height", "mass"):
+        return into_none(utl.to_float)
+    if key in ("model", "manufacturer") and is_droid:
+        return none_only
+    if key == "equipment" and is_droid:
+        return lambda value: utl.to_list(value, "|")
+    if key == "instructions" and is_droid:
+        return lambda value: utl.to_list(value, ",")
+    if key == "create_year" and is_droid:
+        return into_none(to_year_era_cached)
+    if key == "force_sensitive" and not is_droid:
+        return none_only
+    if key == "birth_year" and not is_droid:
+        return into_none(to_year_era_cached)
+    if key == "homeworld":
+        return None
+    if key == "species" and not is_droid:
+        return get_species_name
+    return lambda value: value
+
+
+def group_articles_by_news_desk(news_desks, articles):
+    """Returns a dictionary of "news desk" key-value pairs that group the passed in
+    < articles > by their parent news desk. The passed in < news_desks > list provides
+    the keys while each news desk's < articles > are stored in a list and assigned to
+    the appropriate "news desk" key. Each key-value pair is structured as follows:
+
+    {
+        < news_desk_name_01 >: [{< article_01 >}, {< article_05 >}, ...],
+        < news_desk_name_02 >: [{< article_20 >}, {< article_31 >}, ...],
+        ...
+    }
+
+    Each dictionary that represents an article is a "thinned" version of the New York Times
+    original and consists of the following key-value pairs ordered as follows:
+
+    Key order:
+        web_url
+        headline_main (new name)
+        news_desk
+        byline_original (new name)
+        document_type
+        material_type (new name)
+        abstract
+        word_count
+        pub_date
+
+    Parameters:
+        news_desks (list): list of news_desk names
+        articles (list): nested dictionary representations of New York Times articles
+
+    Returns
+        dict: key-value pairs that group articles by their parent news desk
+    """
+
+    grouped_articles = {news_desk: [] for news_desk in news_desks}
+
+    # Loop through each article
+    for article in articles:
+        # Extract the news desk of the article
+        article_news_desk = article.get("news_desk")
+
+        # If the article's news desk is one of the news desks (dictionary lookup)
+        if article_news_desk in grouped_articles:
+            # Add a thinned copy of the article to the corresponding list in the dictionary
+            grouped_articles[article_news_desk].append(thin_article(article))
+
+    return grouped_articles
+
+
+def group_articles_by_news_desk_single_pass(articles, none_values):
+    """Combines < get_news_desks() > and < group_articles_by_news_desk() > into a single pass
+    over the passed in < articles >. Because the < articles > are only iterated once they may
+    be supplied by a generator (e.g., one that reads a large file incrementally) rather than a
+    list held in memory.
+
+    Delegates to the function < utl.to_none > the task of converting "news_desk" values that
+    equal "None" (a string) to None; articles without a "truthy" news desk are skipped.
+    Delegates to the function < thin_article > the task of creating each "thinned" article.
+
+    Parameters:
+        articles (iterable): nested dictionary representations of New York Times articles
+        none_values (tuple): strings to convert to None
+
+    Returns:
+        tuple: news desk strings sorted alphanumerically (list), key-value pairs that group
+               thinned articles by their parent news desk in news desk order (dict), and
+               key-value pairs that count the articles of each news desk (dict)
+    """
+
+    groups = {}
+    for article in articles:
+        news_desk = article.get("news_desk")
+        if utl.to_none(news_desk, none_values):
+            groups.setdefault(news_desk, []).append(thin_article(article))
+
+    news_desks = sorted(groups)
+    grouped_articles = {news_desk: groups[news_desk] for news_desk in news_desks}
+    counts = {news_desk: len(groups[news_desk]) for news_desk in news_desks}
+
+    return news_desks, grouped_articles, counts
+
+
+def has_viewer_data(episode):
+    """Checks the truth value of an episode's "episode_us_viewers_mm" key-value pair. Returns
+    True if the truth value is "truthy" (e.g., numeric values that are not 0, non-empty sequences
+    or dictionaries, boolean True); otherwise returns False if a "falsy" value is detected (e.g.,
+    empty sequences (including empty or blank strings), 0, 0.0, None, boolean False)).
+
+    Parameters:
+        episode (dict): represents an episode
+
+    Returns:
+        bool: True if "episode_us_viewers_mm" value is truthy; otherwise False
+    """
+
+    return bool(episode.get("episode_us_viewers_mm"))
+
+
+def import_cache(filepath, overwrite=False):
+    """Merges a bundle created by < export_cache > into the local < cache >. The bundle's
+    version and checksum are verified before any entries are merged. Entries already present
+    in the < cache > are retained unless < overwrite > is True. The mutated cache is written
+    to the file system once, and only if at least one entry was merged.
+
+    Parameters:
+        filepath (str): path to the bundle file
+        overwrite (bool): replace existing cache entries with bundled entries
+
+    Returns:
+        int: number of cache entries merged
+    """
+
+    with gzip.open(filepath, "rt", encoding="utf-8") as file_obj:
+        bundle = json.load(file_obj)
+
+    if bundle.get("version") != CACHE_BUNDLE_VERSION:
+        raise ValueError(f"Unsupported cache bundle version: {bundle.get('version')}")
+    entries = bundle["entries"]
+    if get_cache_checksum(entries) != bundle.get("checksum"):
+        raise ValueError(f"Cache bundle checksum mismatch: {filepath}")
+
+    merged = 0
+    for key, value in entries.items():
+        if overwrite or key not in cache:
+            cache[key] = value
+            merged += 1
+    if merged:
+        utl.write_json(CACHE_FILEPATH, cache)  # persist mutated cache
+
+    return merged
+
+
+def infer_column_converters(rows, none_values, overrides=None, sample_size=None):
+    """Derives a per-column converter plan from the passed in < rows > (e.g., the nested
+    dictionaries read from data-clone_wars_episodes.csv) in a single pass. The first
+    < sample_size > rows (all rows if None) are sampled. Values found in < none_values > are
+    ignored. A column is assigned:
+
+    * < utl.to_int > if every sampled value is a whole number (e.g., "3", "1,200")
+    * < utl.to_float > if every sampled value is a number (e.g., "4.92")
+    * None (no conversion) otherwise
+
+    The caller may override the inferred type of any column by passing in < overrides >, a
+    dictionary of column and type (int, float, list, or str) key-value pairs. List values are
+    split on ", ". The str type leaves the column unconverted. A < sample_size > of 0 samples
+    no rows and returns converters for the < overrides > only.
+
+    Parameters:
+        rows (list): nested dictionaries
+        none_values (tuple): strings to ignore
+        overrides (dict): optional column and type key-value pairs
+        sample_size (int): number of rows to sample
+
+    Returns:
+        dict: column and converter (or None) key-value pairs
+    """
+
+    type_converters = {
+        int: utl.to_int,
+        float: utl.to_float,
+        list: lambda value: utl.to_list(value, ", "),
+        str: None,
+        None: None,
+    }
+    overrides = overrides if overrides else {}
+
+    inferred = {}  # column -> type (None until a value is sampled)
+    for row in islice(rows, sample_size):
+        for key, value in row.items():
+            column_type = inferred.get(key)
+            if column_type is str or key in overrides or value in none_values:
+                inferred.setdefault(key, None)
+                continue
+            match = NUMBER_PATTERN.fullmatch(value) if isinstance(value, str) else None
+            if not match:
+                inferred[key] = str
+            elif match.group(1) or column_type is float:
+                inferred[key] = float
+            else:
+                inferred[key] = int
+
+    converters = {key: type_converters[column_type] for key, column_type in inferred.items()}
+    for key, column_type in overrides.items():
+        converters[key] = type_converters[column_type]
+
+    return converters
+
+
+def init_transform_worker(keys, none_values, kwargs):
+    """Worker process initializer for < transform_parallel() >. Stores the arguments shared by
+    every < transform_*() > call in the module-level < worker_state > dictionary so they are
+    shipped to each worker process once rather than with every chunk of records.
+
+    Parameters:
+        keys (dict): old key to new key mappings
+        none_values (tuple): strings to convert to None
+        kwargs (dict): additional keyword arguments (e.g., planets, is_droid)
+
+    Returns:
+        None
+    """
+
+    worker_state["keys"] = keys
+    worker_state["none_values"] = none_values
+    worker_state["kwargs"] = kwargs
+
+
+def intern_converter(convert):
+    """Returns a function that calls the passed in < convert > function and interns the string
+    value (or each string in the list value) it returns using < sys.intern() > so that records
+    sharing a value (e.g., "temperate") reference a single string object.
+
+    Parameters:
+        convert (function): value converter
+
+    Returns:
+        function: interning value converter
+    """
+
+    def converter(value):
+        value = convert(value)
+        if isinstance(value, str):
+            return sys.intern(value)
+        if isinstance(value, list):
+            return [sys.intern(item) if isinstance(item, str) else item for item in value]
+        return value
+
+    return converter
+
+
+def iter_json_chunks(data, indent=2, chunk_size=JSON_CHUNK_SIZE):
+    """Encodes the passed in < data > as JSON incrementally and yields the encoded output in
+    buffered chunks of approximately < chunk_size > characters. Array elements and dictionary
+    entries are encoded as they are reached (see < json.JSONEncoder.iterencode() >) so the fully
+    formatted document is never built in memory. If < indent > is None the compact fast path is
+    used (no indentation or whitespace after separators). < Record > instances are encoded by
+    < encode_record() >.
+
+    Parameters:
+        data (dict)/(list): the data to be encoded as JSON
+        indent (int): number of "pretty printed" indention spaces applied to encoded JSON
+        chunk_size (int): approximate number of characters per chunk
+
+    Returns:
+        generator: encoded JSON chunks
+    """
+
+    encoder = json.JSONEncoder(
+        ensure_ascii=False,
+        indent=indent,
+        separators=(",", ":") if indent is None else None,
+        default=encode_record,
+    )
+
+    buffer = []
+    size = 0
+    for fragment in encoder.iterencode(data):
+        buffer.append(fragment)
+        size += len(fragment)
+        if size >= chunk_size:
+            yield "".join(buffer)
+            buffer.clear()
+            size = 0
+    if buffer:
+        yield "".join(buffer)
+
+
+def join_swapi_wookiee(swapi_records, wookiee_records, precedence="wookiee", field_precedence=None):
+    """Combines each SWAPI record with its Wookieepedia counterpart in a single hash-join
+    pass. The < wookiee_records > are indexed by their normalized "name" value (see
+    < normalize_name() >) and each SWAPI record is then matched with one dictionary lookup. The
+    first Wookieepedia record wins if several share a normalized name.
+
+    Conflicting key-value pairs are resolved by < precedence > ("wookiee" or "swapi"). The
+    caller may override the precedence of individual keys by passing in < field_precedence >
+    (e.g., {"url": "swapi"}). SWAPI records without a Wookieepedia counterpart are returned
+    unmerged. The records are not mutated; new dictionaries are returned in SWAPI order, ready
+    to be passed to < transform_sentient_being() >.
+
+    Parameters:
+        swapi_records (list): SWAPI dictionaries
+        wookiee_records (list): Wookieepedia dictionaries
+        precedence (str): "wookiee" or "swapi"; source whose value wins a conflict
+        field_precedence (dict): optional key and precedence key-value pairs
+
+    Returns:
+        list: merged dictionaries
+    """
+
+    if precedence not in ("wookiee", "swapi"):
+        raise ValueError(f"Unknown precedence: {precedence}")
+    field_precedence = field_precedence if field_precedence else {}
+
+    index = {}
+    for wookiee_record in wookiee_records:
+        index.setdefault(normalize_name(wookiee_record.get("name")), wookiee_record)
+
+    merged_records = []
+    for swapi_record in swapi_records:
+        merged = dict(swapi_record)
+        wookiee_record = index.get(normalize_name(swapi_record.get("name")))
+        if wookiee_record:
+            for key, value in wookiee_record.items():
+                if key not in merged or field_precedence.get(key, precedence) == "wookiee":
+                    merged[key] = value
+        merged_records.append(merged)
+
+    return merged_records
+
+
+def load_reference_snapshot(
+    filepath=REFERENCE_SNAPSHOT_FILEPATH, sources=REFERENCE_SOURCES, none_values=NONE_VALUES
+):
+    """Returns the reference data stored in the snapshot located at < filepath > if the
+    snapshot's JSON header matches the current fingerprint returned by
+    < get_reference_fingerprint() >. The header is read and compared before the pickled data
+    is loaded; a stale snapshot or a file that is not a snapshot is rejected without being
+    unpickled. Returns None if the snapshot is missing, unreadable, or stale.
+
+    WARN: the pickled data that follows a matching header is trusted. Only load snapshots
+    written by < build_reference_snapshot() >; never load a snapshot obtained from an
+    untrusted source.
+
+    Parameters:
+        filepath (str): path to the snapshot file
+        sources (dict): dataset name and source file path key-value pairs
+        none_values (tuple): strings to test and convert to None
+
+    Returns:
+        dict|None: parsed and converted reference data
+    """
+
+    try:
+        with open(filepath, "rb") as file_obj:
+            header = file_obj.readline(REFERENCE_SNAPSHOT_HEADER_SIZE)
+            try:
+                fingerprint = json.loads(header)
+            except ValueError:
+                return None
+            if fingerprint != get_reference_fingerprint(sources, none_values):
+                return None
+            data = pickle.load(file_obj)
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+        return None
+
+    return data if isinstance(data, dict) else None
+
+
+def make_record(entity_type, fields, values):
+    """Returns a new < Record > of the type returned by < get_record_type() > for the passed
+    in < entity_type > and < fields >. Used to unpickle records (e.g., records returned by
+    < transform_parallel() > worker processes).
+
+    Parameters:
+        entity_type (str): "planet", "starship", "person", or "droid"
+        fields (tuple): new key names in order
+        values (tuple): values in < fields > order
+
+    Returns:
+        Record: new record
+    """
+
+    return get_record_type(entity_type, fields)(*values)
+
+
+def memoize_converter(fallback, copy_result=False, maxsize=CONVERTER_CACHE_SIZE):
+    """Decorator factory that returns a bounded memoizing variant of a < utl.to_*() >
+    converter. The decorated function is only called for string values not already found in
+    its least recently used cache (at most < maxsize > entries keyed on the raw string and any
+    additional arguments); repeated strings such as "19BBY" or "1 standard" are converted with
+    a single cache lookup. Non-string values bypass the cache and are passed to < fallback >
+    (the original < utl.to_*() > function).
+
+    WARN: the wrapper and cache add per-call overhead. Only memoize converters whose parsing
+    costs more than that overhead (< utl.to_year_era() >, < utl.to_gravity_value() >); cheap
+    converters such as < utl.to_none() >, < utl.to_int() >, or < utl.to_list() > are faster
+    when called directly.
+
+    Immutable results (int, float, str, None) are shared. Mutable results (list, dict) are
+    shallow copied when < copy_result > is True so that callers may mutate them safely.
+
+    Parameters:
+        fallback (function): converter called for non-string values
+        copy_result (bool): return a shallow copy of the cached result
+        maxsize (int): maximum number of cached conversions
 
     Returns:
-        list: nested episode dictionaries containing mutated key-value pairs
+        function: decorator
     """
 
-    for episode in episodes:
-        for key, value in episode.items():
-            if value in none_values:
-                episode[key] = None
-            elif key in [
-                "series_season_num",
-                "series_episode_num",
-                "season_episode_num",
-            ]:
-                episode[key] = utl.to_int(value)
-            elif key in ["episode_prod_code", "episode_us_viewers_mm"]:
-                episode[key] = utl.to_float(value)
-            elif key == "episode_writers":
-                episode[key] = utl.to_list(value, ", ")
-            else:
-                continue  # If no conversion is necessary, move to the next item
+    def decorator(convert):
+        cached_convert = functools.lru_cache(maxsize=maxsize)(convert)
 
-    return episodes
+        @functools.wraps(convert)
+        def converter(value, *args):
+            if not isinstance(value, str):
+                return fallback(value, *args)
+            result = cached_convert(value, *args)
+            return copy.copy(result) if copy_result else result
 
+        converter.cache_clear = cached_convert.cache_clear
+        converter.cache_info = cached_convert.cache_info
+        return converter
 
-def get_most_viewed_episode(episodes):
-    """Identifies and returns a list of one or more episodes with the highest recorded
-    viewership. Ignores episodes with no viewship value. Includes in the list only those
-    episodes that tie for the highest recorded viewership. If no ties exist only one
-    episode will be returned in the list. Delegates to the function < has_viewer_data >
-    the task of determining if the episode includes viewership "episode_us_viewers_mm"
-    numeric data.
+    return decorator
+
+
+def normalize_name(name):
+    """Returns the join key of the passed in < name >: Unicode-normalized (NFKC), case folded,
+    with leading, trailing, and repeated whitespace removed (e.g., " Padmé  Amidala" ->
+    "padmé amidala"). Returns None if < name > is not a string.
 
     Parameters:
-        episodes (list): nested episode dictionaries
+        name (str): name to normalize
 
     Returns:
-        list: episode(s) with the highest recorded viewership.
+        str|None: normalized name
     """
 
-    max_viewers = 0
-    most_viewed_episodes = []
+    if not isinstance(name, str):
+        return None
+    return " ".join(unicodedata.normalize("NFKC", name).casefold().split())
 
-    for episode in episodes:
-        # Check if the episode has viewership data
-        if has_viewer_data(episode):
-            viewers = float(episode["episode_us_viewers_mm"])
-            # Compare with the maximum viewers found so far
-            if viewers > max_viewers:
-                max_viewers = viewers
-                most_viewed_episodes = [episode]
-            elif viewers == max_viewers:
-                most_viewed_episodes.append(episode)
 
-    return most_viewed_episodes
+def profile_stage(name):
+    """Returns a context manager that measures the statements executed within it as the
+    pipeline stage < name > (e.g., "3.4 CHALLENGE 04"). Profiling is enabled by setting the
+    LAST_ASSIGNMENT_PROFILE environment variable (see < PROFILE >). If profiling is disabled a
+    do-nothing < contextlib.nullcontext() > is returned.
 
+    The following measurements are appended to the module-level < stage_profiles > list:
 
-def get_news_desks(articles, none_values):
-    """Returns a list of New York Times news desks sourced from the passed in
-    < articles > list. Accesses the news desk name from each article's "news_desk"
-    key-value pair. Filters out duplicates in order to guarantee uniqueness. The
-    list sorted alphanumerically before being returned to the caller.
-
-    Delegates to the function < utl.to_none > the task of converting "news_desk"
-    values that equal "None" (a string) to None. Only news_desk values that are "truthy"
-    (i.e., not None) are returned in the list.
+    * wall_s: elapsed wall clock time in seconds
+    * cpu_s: elapsed process CPU time in seconds
+    * peak_mem_kb: peak traced memory allocated above the starting level in KiB
+    * swapi_cache: SWAPI resources served from the < cache >
+    * swapi_remote: SWAPI resources retrieved remotely
 
     Parameters:
-        articles (list): nested dictionary representations of New York Times articles
-        none_values (tuple): strings to convert to None
+        name (str): stage name
 
     Returns:
-        list: news desk strings (no duplicates) sorted alphanumerically
+        contextmanager: stage profiler
     """
-    news_desks = []
-    for article in articles:
-        news_desk = utl.to_none(article.get("news_desk"), none_values)
-        if (
-            news_desk and news_desk not in news_desks
-        ):  # Check for truthiness and uniqueness
-            news_desks.append(news_desk)
-
-    return sorted(news_desks)
 
+    if not PROFILE:
+        return contextlib.nullcontext()
+    return profile_stage_enabled(name)
 
-def get_swapi_resource(url, params=None, timeout=10, verify=True):
-    """Retrieves a deep copy of a SWAPI resource from either the local < cache >
-    dictionary or from a remote API if no local copy exists. Delegates to the function
-    < utl.create_cache_key > the task of minting a key that is used to identify a cached
-    resource. If the desired resource is not located in the cache, delegates to the
-    function < get_resource > the task of retrieving the resource from SWAPI.
-    A deep copy of the resource retrieved remotely is then added to the local < cache > by
-    mapping it to a new < cache[key] >. The mutated cache is written to the file
-    system before a deep copy of the resource is returned to the caller.
 
-    WARN: Deep copying is required to guard against possible mutatation of the cached
-    objects when dictionaries representing SWAPI entities (e.g., films, people, planets,
-    species, starships, and vehicles) are modified by other processes.
+@contextlib.contextmanager
+def profile_stage_enabled(name):
+    """Context manager that performs the measurements described in < profile_stage() >.
+    Memory is traced with < tracemalloc >, which is started on first use.
 
     Parameters:
-        url (str): a uniform resource locator that specifies the resource.
-        params (dict): optional dictionary of querystring arguments.
-        timeout (int): timeout value in seconds
-        verify (bool): verify server's TSL certificate
+        name (str): stage name
 
     Returns:
-        dict|list: requested resource sourced from either the local cache or a remote API
+        generator: stage profiler
     """
 
-    key = utl.create_cache_key(url, params)
-    if key in cache.keys():
-        return copy.deepcopy(cache[key])  # recursive copy of objects
-    else:
-        resource = utl.get_resource(url, params, timeout, verify)
-        cache[key] = copy.deepcopy(resource)  # recursive copy of objects
-        utl.write_json(CACHE_FILEPATH, cache)  # persist mutated cache
-        return resource
-
+    if not tracemalloc.is_tracing():
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    start_mem = tracemalloc.get_traced_memory()[0]
+    start_calls = dict(swapi_calls)
+    start_wall = time.perf_counter()
+    start_cpu = time.process_time()
+    try:
+        yield
+    finally:
+        stage_profiles.append(
+            {
+                "stage": name,
+                "wall_s": round(time.perf_counter() - start_wall, 6),
+                "cpu_s": round(time.process_time() - start_cpu, 6),
+                "peak_mem_kb": round((tracemalloc.get_traced_memory()[1] - start_mem) / 1024, 1),
+                "swapi_cache": swapi_calls["cache"] - start_calls["cache"],
+                "swapi_remote": swapi_calls["remote"] - start_calls["remote"],
+            }
+        )
 
-def group_articles_by_news_desk(news_desks, articles):
-    """Returns a dictionary of "news desk" key-value pairs that group the passed in
-    < articles > by their parent news desk. The passed in < news_desks > list provides
-    the keys while each news desk's < articles > are stored in a list and assigned to
-    the appropriate "news desk" key. Each key-value pair is structured as follows:
 
-    {
-        < news_desk_name_01 >: [{< article_01 >}, {< article_05 >}, ...],
-        < news_desk_name_02 >: [{< article_20 >}, {< article_31 >}, ...],
-        ...
-    }
+def rank_episodes(episodes, key, k=1, group_by=None, ties=True):
+    """Returns the top < k > episodes ranked in descending order by the value returned by the
+    passed in < key > function. Episodes for which < key > returns None are ignored. Episodes
+    with equal values are ranked in their original order.
 
-    Each dictionary that represents an article is a "thinned" version of the New York Times
-    original and consists of the following key-value pairs ordered as follows:
+    If < ties > is True, episodes that tie with the k-th ranked episode are also included
+    (e.g., rank_episodes(episodes, key, k=1) returns every episode that ties for first). If
+    < group_by > is provided (e.g., "series_season_num") episodes are ranked within each group
+    and a dictionary of group and ranked episodes key-value pairs is returned.
 
-    Key order:
-        web_url
-        headline_main (new name)
-        news_desk
-        byline_original (new name)
-        document_type
-        material_type (new name)
-        abstract
-        word_count
-        pub_date
+    All groups are ranked in a single pass. Each group retains at most < k > episodes (plus
+    ties) in a min-heap so the cost is O(n log k) rather than a full sort.
 
     Parameters:
-        news_desks (list): list of news_desk names
-        articles (list): nested dictionary representations of New York Times articles
+        episodes (list): nested episode dictionaries
+        key (function): returns the value to rank an episode by (or None)
+        k (int): number of episodes to return (per group)
+        group_by (str): optional key whose value identifies an episode's group
+        ties (bool): include episodes that tie with the k-th ranked episode
 
-    Returns
-        dict: key-value pairs that group articles by their parent news desk
+    Returns:
+        list|dict: ranked episodes or group and ranked episodes key-value pairs
     """
 
-    grouped_articles = {news_desk: [] for news_desk in news_desks}
-
-    # Loop through each article
-    for article in articles:
-        # Extract the news desk of the article
-        article_news_desk = article.get("news_desk")
-
-        # If the article's news desk is in the list of news desks
-        if article_news_desk in news_desks:
-            # Create a thinned article dictionary
-            thinned_article = {
-                "web_url": article.get("web_url"),
-                "headline_main": article.get("headline", {}).get("main"),
-                "news_desk": article_news_desk,
-                "byline_original": article.get("byline", {}).get("original"),
-                "document_type": article.get("document_type"),
-                "material_type": article.get("type_of_material"),
-                "abstract": article.get("abstract"),
-                "word_count": article.get("word_count"),
-                "pub_date": article.get("pub_date"),
-            }
+    groups = {}  # group -> (heap, tied)
+
+    for i, episode in enumerate(episodes):
+        value = key(episode)
+        if value is None or k < 1:
+            continue
+        heap, tied = groups.setdefault(episode.get(group_by) if group_by else None, ([], []))
+        entry = (value, -i, episode)  # heap[0] is the lowest ranked episode
+
+        if len(heap) < k:
+            heapq.heappush(heap, entry)
+        elif value > heap[0][0]:
+            evicted = heapq.heappushpop(heap, entry)
+            if ties and evicted[0] == heap[0][0]:
+                tied.append(evicted)
+            else:
+                tied.clear()
+        elif ties and value == heap[0][0]:
+            tied.append(entry)
 
-            # Add this thinned article to the corresponding list in the dictionary
-            grouped_articles[article_news_desk].append(thinned_article)
+    ranked = {
+        group: [entry[2] for entry in sorted(heap + tied, key=lambda entry: entry[:2], reverse=True)]
+        for group, (heap, tied) in groups.items()
+    }
 
-    return grouped_articles
+    if group_by:
+        return ranked
+    return ranked.get(None, [])
 
 
-def has_viewer_data(episode):
-    """Checks the truth value of an episode's "episode_us_viewers_mm" key-value pair. Returns
-    True if the truth value is "truthy" (e.g., numeric values that are not 0, non-empty sequences
-    or dictionaries, boolean True); otherwise returns False if a "falsy" value is detected (e.g.,
-    empty sequences (including empty or blank strings), 0, 0.0, None, boolean False)).
+def read_csv_to_columns(filepath, encoding="utf-8-sig", newline="", delimiter=","):
+    """Accepts a file path for a .csv file to be read, creates a file object, and uses
+    csv.reader() to return a dictionary of columns. Each key is a column name sourced from
+    the header row and each value is a list of the column's row values. Blank rows are
+    skipped and rows that are short one or more values are padded with None to the length of
+    the header row (matching csv.DictReader()). Values beyond the header row's length are
+    dropped. Every row is held in memory while the rows are transposed into columns.
 
     Parameters:
-        episode (dict): represents an episode
+        filepath (str): path to csv file
+        encoding (str): name of encoding used to decode the file
+        newline (str): specifies replacement value for newline '\n'
+                       or '\r\n' (Windows) character sequences
+        delimiter (str): delimiter that separates the row values
 
     Returns:
-        bool: True if "episode_us_viewers_mm" value is truthy; otherwise False
+        dict: column name and row values key-value pairs
     """
 
-    return bool(episode.get("episode_us_viewers_mm"))
+    with open(filepath, "r", newline=newline, encoding=encoding) as file_obj:
+        reader = csv.reader(file_obj, delimiter=delimiter)
+        header = next(reader, [])
+        width = len(header)
+        rows = [row + [None] * (width - len(row)) for row in reader if row]
+        columns = {name: [] for name in header}
+        columns.update(zip(header, map(list, zip(*rows))))
+        return columns
 
 
-def transform_sentient_being(data, keys, none_values, planets=None, is_droid=False):
+def transform_sentient_being(
+    data, keys, none_values, planets=None, is_droid=False, as_record=False, homeworlds=None
+):
     """Returns a new "thinned" dictionary representation of both organic (i.e., person) and
     mechanical (i.e., droid) sentient beings based on the passed in < data > dictionary with
     string values converted to more appropriate types.
@@ -293,8 +1844,8 @@ def transform_sentient_being(data, keys, none_values, planets=None, is_droid=Fal
 
     < data > values are converted to more appropriate types as outlined below under "Mappings".
     Strings found in < none_values > are converted to < None > irrespective of case. Type
-    conversions are delegated to the various < utl.to_*() > functions. If a new key lacks a
-    corresponding < data > value < None > is assigned.
+    conversions are delegated to the converters compiled by < get_transform_plan() >. If a new
+    key lacks a corresponding < data > value < None > is assigned.
 
     Each targeted < data > value is then mapped to the new key when assigning the new key-value
     pair to the new "person" dictionary. Some overlap exists between droid and person keys
@@ -303,16 +1854,14 @@ def transform_sentient_being(data, keys, none_values, planets=None, is_droid=Fal
 
     Additionally, a person's "homeworld" and "species" key-value pairs require special handling.
 
-    Retrieving a dictionary representation of the person's home planet is delegated to the
-    function < get_swapi_resource() >. If the caller passes in a Wookieepedia-sourced
-    < planets > list this function delegates to the function < utl.get_nested_dict() > the task
-    of retrieving the Wookieepedia representation of the homeworld from < planets >.
-    If the homeworld is found in < planets > the SWAPI and Wookieepedia dictionaries are
-    combined. Cleaning the homeworld dictionary is delegated to the function < transform_planet() >.
+    Retrieving and cleaning a dictionary representation of the person's home planet is
+    delegated to the function < transform_homeworld() >, which combines the SWAPI planet with
+    its Wookieepedia counterpart in < planets > if the caller passes in a Wookieepedia-sourced
+    < planets > list. If the caller passes in a < homeworlds > dictionary it serves as a per-run
+    memo of transformed homeworlds keyed by planet URL (see < transform_homeworld() >).
 
-    Likewise, retrieving a representation of the person's species is delegated to the function
-    < get_swapi_resource() >. From the dictionary returned the "name" value is accessed and mapped
-    to the new dictionary's "species" key.
+    Likewise, retrieving the person's species name is delegated to the function
+    < get_species_name() >. The name is mapped to the new dictionary's "species" key.
 
     Person mappings (old key -> new key):
         url (str) -> url (str)
@@ -341,51 +1890,338 @@ def transform_sentient_being(data, keys, none_values, planets=None, is_droid=Fal
         none_values (tuple): strings to convert to None
         planets (list): Supplementary planet data
         is_droid (bool): True if the sentient being is a droid
+        as_record (bool): return a compact < Record > rather than a dictionary
+        homeworlds (dict): optional memo of transformed homeworlds keyed by planet URL
 
     Returns:
-        dict: new dictionary representation of a person
+        dict|Record: new dictionary representation of a person
     """
 
     new_entity = {}
-    entity_keys = keys["droid"] if is_droid else keys["person"]
+    entity_type = "droid" if is_droid else "person"
+    plan = get_transform_plan(keys, entity_type, none_values)
 
-    for old_key, new_key in entity_keys.items():
+    for old_key, new_key, convert in plan:
         original_value = data.get(old_key)
 
-        if old_key in ["url", "name"]:
-            new_entity[new_key] = utl.to_none(original_value, none_values)
-        elif old_key in ["height", "mass"]:
-            new_entity[new_key] = utl.to_none(utl.to_float(original_value), none_values)
-        elif old_key in ["model", "manufacturer"] and is_droid:
-            new_entity[new_key] = utl.to_none(original_value, none_values)
-        elif old_key in ["equipment"] and is_droid:
-            new_entity[new_key] = utl.to_list(original_value, delimiter="|")
-        elif old_key in ["instructions"] and is_droid:
-            new_entity[new_key] = utl.to_list(original_value, delimiter=",")
-        elif old_key in ["create_year"] and is_droid:
-            new_entity[new_key] = utl.to_none(utl.to_year_era(original_value), none_values)
-        elif old_key in ["force_sensitive"] and not is_droid:
-            new_entity[new_key] = utl.to_none(original_value, none_values)
-        elif old_key in ["birth_year"] and not is_droid:
-            new_entity[new_key] = utl.to_none(utl.to_year_era(original_value), none_values)
-        elif old_key in ["homeworld"] and original_value:
-            homeworld = get_swapi_resource(original_value)
-            if planets:
-                wookiee_homeworld = utl.get_nested_dict(planets, "name", homeworld["name"])
-                if wookiee_homeworld:
-                    homeworld["url"] = wookiee_homeworld.get("url", homeworld.get("url"))
-                    homeworld.update(wookiee_homeworld)
-            new_entity[new_key] = transform_planet(homeworld, keys, none_values) 
-        elif old_key == "species" and not is_droid:
-            species_info = get_swapi_resource(original_value[0])
-            new_entity[new_key] = species_info["name"] if species_info else None
+        if convert:
+            new_entity[new_key] = convert(original_value)
+        elif original_value:
+            new_entity[new_key] = transform_homeworld(
+                original_value, keys, none_values, planets, homeworlds
+            )
         else:
             new_entity[new_key] = original_value
 
+    if as_record:
+        return get_record_type(entity_type, tuple(new_entity))(*new_entity.values())
     return new_entity
 
 
-def transform_planet(data, keys, none_values):
+def report_stage_profiles():
+    """Reports the measurements recorded by < profile_stage() >. If < PROFILE > is a .json
+    filepath the measurements are written to it; otherwise a summary table is printed. Does
+    nothing if profiling is disabled.
+
+    Parameters:
+        None
+
+    Returns:
+        None
+    """
+
+    if not PROFILE:
+        return
+    if PROFILE.endswith(".json"):
+        write_json_atomic(PROFILE, stage_profiles)
+        return
+
+    columns = ("stage", "wall_s", "cpu_s", "peak_mem_kb", "swapi_cache", "swapi_remote")
+    print(f"{columns[0]:<20}" + "".join(f"{column:>14}" for column in columns[1:]))
+    for profile in stage_profiles:
+        print(f"{profile['stage']:<20}" + "".join(f"{profile[column]:>14}" for column in columns[1:]))
+
+
+def set_file_mode(tmp_filepath, filepath):
+    """Copies the permission bits of the existing < filepath > (if any) to the temporary file
+    located at < tmp_filepath > before it is renamed to < filepath >. If < filepath > does not
+    exist the temporary file retains the mode assigned by < create_temp_file() > (0666 less
+    the process umask).
+
+    Parameters:
+        tmp_filepath (str): the path to the temporary file
+        filepath (str): the path to the destination file
+
+    Returns:
+        None
+    """
+
+    try:
+        mode = os.stat(filepath).st_mode & 0o777
+    except FileNotFoundError:
+        return
+    os.chmod(tmp_filepath, mode)
+
+
+def stream_csv_to_json(
+    src_filepath,
+    dst_filepath,
+    transform,
+    keys,
+    none_values,
+    ndjson=False,
+    encoding="utf-8",
+    indent=2,
+    **kwargs,
+):
+    """Streams the rows of the .csv file located at < src_filepath > through < transform >
+    (e.g., < transform_planet() >) and writes each new dictionary to < dst_filepath > as soon
+    as it is created. Rows are read lazily with csv.DictReader() so only one row is held in
+    memory at a time irrespective of the size of the file.
+
+    If < ndjson > is True each record is written compactly on its own line (newline-delimited
+    JSON); otherwise the records are written as a JSON array formatted as < utl.write_json() >
+    formats a list of dictionaries (or compactly if < indent > is None). Records are written
+    to a temporary file that replaces < dst_filepath > (see < write_json_atomic() >) only once
+    every row has been transformed; a failed transform leaves < dst_filepath > untouched.
+
+    Parameters:
+        src_filepath (str): path to csv file
+        dst_filepath (str): path to the JSON file to write
+        transform (function): transform_planet, transform_starship, or transform_sentient_being
+        keys (dict): old key to new key mappings
+        none_values (tuple): strings to convert to None
+        ndjson (bool): write newline-delimited JSON rather than a JSON array
+        encoding (str): name of encoding used to encode the file
+        indent (int): number of "pretty printed" indention spaces applied to encoded JSON
+                      (None for compact output)
+        kwargs (dict): additional keyword arguments passed to < transform >
+
+    Returns:
+        int: number of records written
+    """
+
+    count = 0
+    if indent is None:
+        separators, opener, delimiter, closer = (",", ":"), "[", ",", "]"
+        prefix = ""
+    else:
+        separators, opener, delimiter, closer = None, "[\n", ",\n", "\n]"
+        prefix = " " * indent
+
+    fd, tmp_filepath = create_temp_file(dst_filepath, ".json")
+    try:
+        with open(fd, "w", encoding=encoding) as dst_obj, open(
+            src_filepath, "r", newline="", encoding="utf-8-sig"
+        ) as src_obj:
+            for row in csv.DictReader(src_obj):
+                record = transform(row, keys, none_values, **kwargs)
+                if ndjson:
+                    dst_obj.write(json.dumps(record, ensure_ascii=False, default=encode_record))
+                    dst_obj.write("\n")
+                else:
+                    encoded = json.dumps(
+                        record,
+                        ensure_ascii=False,
+                        indent=indent,
+                        separators=separators,
+                        default=encode_record,
+                    )
+                    dst_obj.write(delimiter if count else opener)
+                    dst_obj.write(prefix + encoded.replace("\n", "\n" + prefix))
+                count += 1
+
+            if not ndjson:
+                dst_obj.write(closer if count else "[]")
+            dst_obj.flush()
+            os.fsync(dst_obj.fileno())
+        set_file_mode(tmp_filepath, dst_filepath)
+        os.replace(tmp_filepath, dst_filepath)
+    except BaseException:
+        os.remove(tmp_filepath)
+        raise
+
+    return count
+
+
+def thin_article(article):
+    """Returns a "thinned" version of a New York Times < article > that consists of the
+    following key-value pairs ordered as follows:
+
+    Key order:
+        web_url
+        headline_main (new name)
+        news_desk
+        byline_original (new name)
+        document_type
+        material_type (new name)
+        abstract
+        word_count
+        pub_date
+
+    Parameters:
+        article (dict): nested dictionary representation of a New York Times article
+
+    Returns:
+        dict: thinned article
+    """
+
+    return {
+        "web_url": article.get("web_url"),
+        "headline_main": article.get("headline", {}).get("main"),
+        "news_desk": article.get("news_desk"),
+        "byline_original": article.get("byline", {}).get("original"),
+        "document_type": article.get("document_type"),
+        "material_type": article.get("type_of_material"),
+        "abstract": article.get("abstract"),
+        "word_count": article.get("word_count"),
+        "pub_date": article.get("pub_date"),
+    }
+
+
+@memoize_converter(utl.to_gravity_value)
+def to_gravity_value_cached(value):
+    """Memoized < utl.to_gravity_value() > (see < memoize_converter() >).
+
+    Parameters:
+        value (str): string to convert
+
+    Returns:
+        float|str: converted value or the passed in value if it cannot be converted
+    """
+
+    return utl.to_gravity_value(value)
+
+
+@memoize_converter(utl.to_year_era, copy_result=True)
+def to_year_era_cached(value):
+    """Memoized < utl.to_year_era() > (see < memoize_converter() >). Strings that match the
+    precompiled < YEAR_ERA_PATTERN > (e.g., "19BBY") are parsed directly; other strings are
+    delegated to < utl.to_year_era() >. A new dictionary is returned on each call.
+
+    Parameters:
+        value (str): string to convert
+
+    Returns:
+        dict|str: year and era or the passed in value if it cannot be converted
+    """
+
+    match = YEAR_ERA_PATTERN.fullmatch(value)
+    if match:
+        return {"year": int(match.group(1)), "era": match.group(2)}
+    return utl.to_year_era(value)
+
+
+def transform_chunk(transform, chunk):
+    """Worker process task for < transform_parallel() >. Calls < transform > for each record
+    in the passed in < chunk > with the arguments stored by < init_transform_worker() >.
+
+    Parameters:
+        transform (function): transform_planet, transform_starship, or transform_sentient_being
+        chunk (list): source records
+
+    Returns:
+        list: new dictionary representations of the records
+    """
+
+    keys = worker_state["keys"]
+    none_values = worker_state["none_values"]
+    kwargs = worker_state["kwargs"]
+
+    return [transform(record, keys, none_values, **kwargs) for record in chunk]
+
+
+def transform_homeworld(url, keys, none_values, planets=None, homeworlds=None):
+    """Returns a new "thinned" dictionary representation of a sentient being's home planet.
+    Retrieving the SWAPI representation of the planet located at < url > is delegated to the
+    function < get_swapi_resource() >. If the caller passes in a Wookieepedia-sourced
+    < planets > list this function delegates to the function < get_nested_dict() > the
+    task of retrieving the Wookieepedia representation of the homeworld from < planets >. If
+    the homeworld is found in < planets > the SWAPI and Wookieepedia dictionaries are combined.
+    Cleaning the homeworld dictionary is delegated to the function < transform_planet() >.
+
+    If the caller passes in a < homeworlds > dictionary, transformed homeworlds are memoized in
+    it keyed by < url > so that each planet is retrieved, combined, and transformed only once
+    per run. The memo must only be reused with the same < keys >, < none_values >, and
+    < planets >.
+
+    WARN: Memoized homeworlds are shared by every sentient being from the same planet.
+    Mutating one being's homeworld mutates them all; copy a homeworld before modifying it.
+
+    Parameters:
+        url (str): SWAPI planet URL
+        keys (dict): old key to new key mappings
+        none_values (tuple): strings to convert to None
+        planets (list): Supplementary planet data
+        homeworlds (dict): optional memo of transformed homeworlds keyed by planet URL
+
+    Returns:
+        dict: new dictionary representation of a planet
+    """
+
+    if homeworlds is not None and url in homeworlds:
+        return homeworlds[url]
+
+    homeworld = get_swapi_resource(url)
+    if planets:
+        wookiee_homeworld = get_nested_dict(planets, "name", homeworld["name"])
+        if wookiee_homeworld:
+            homeworld["url"] = wookiee_homeworld.get("url", homeworld.get("url"))
+            homeworld.update(wookiee_homeworld)
+
+    homeworld = transform_planet(homeworld, keys, none_values)
+    if homeworlds is not None:
+        homeworlds[url] = homeworld
+
+    return homeworld
+
+
+def transform_parallel(
+    records,
+    transform,
+    keys,
+    none_values,
+    chunk_size=PARALLEL_CHUNK_SIZE,
+    max_workers=None,
+    **kwargs,
+):
+    """Transforms large collections of records (e.g., Wookieepedia planets, starships, people,
+    or droids) across multiple CPU cores. The < records > are split into chunks of
+    < chunk_size > records and each chunk is passed to < transform_chunk() > in a
+    < ProcessPoolExecutor > worker process. The < keys >, < none_values >, and any additional
+    keyword arguments (e.g., planets=planets, is_droid=True) are shipped to each worker
+    once via < init_transform_worker() >. Results are merged in input order.
+
+    WARN: < transform_sentient_being > retrieves homeworlds and species from each worker's
+    copy of the < cache >. Warm the cache beforehand so that worker processes do not fetch
+    (and persist) the same resources concurrently.
+
+    Parameters:
+        records (iterable): source records
+        transform (function): transform_planet, transform_starship, or transform_sentient_being
+        keys (dict): old key to new key mappings
+        none_values (tuple): strings to convert to None
+        chunk_size (int): number of records per task
+        max_workers (int): maximum number of worker processes (defaults to CPU count)
+        kwargs (dict): additional keyword arguments passed to < transform >
+
+    Returns:
+        list: new dictionary representations of the records in input order
+    """
+
+    records = iter(records)
+    chunks = iter(lambda: list(islice(records, chunk_size)), [])
+
+    with ProcessPoolExecutor(
+        max_workers=max_workers,
+        initializer=init_transform_worker,
+        initargs=(keys, none_values, kwargs),
+    ) as executor:
+        results = executor.map(transform_chunk, repeat(transform), chunks)
+        return [record for chunk in results for record in chunk]
+
+
+def transform_planet(data, keys, none_values, as_record=False):
     """Returns a new "thinned" dictionary representation of a planet based on the passed in
     < data > dictionary with string values converted to more appropriate types.
 
@@ -402,8 +2238,8 @@ def transform_planet(data, keys, none_values):
 
     < data > values are converted to more appropriate types as outlined below under "Mappings".
     Strings found in < none_values > are converted to < None > irrespective of case. Type
-    conversions are delegated to the various < utl.to_*() > functions. If a new key lacks a
-    corresponding < data > value < None > is assigned.
+    conversions are delegated to the converters compiled by < get_transform_plan() >. If a new
+    key lacks a corresponding < data > value < None > is assigned.
 
     Each targeted < data > value is then mapped to the new key when assigning the new
     key-value pair to the new "planet" dictionary.
@@ -426,34 +2262,25 @@ def transform_planet(data, keys, none_values):
         data (dict): source data
         keys (dict): old key to new key mappings
         none_values (tuple): strings to convert to None
+        as_record (bool): return a compact < Record > rather than a dictionary
 
     Returns:
-        dict: new dictionary representation of a planet
+        dict|Record: new dictionary representation of a planet
     """
-    transformed_planet = {}
-
-    for old_key, new_key in keys["planet"].items():
-        value = data.get(old_key)
-
-        # Use utl.to_none for converting values in none_values to None
-        value = utl.to_none(value, none_values)
-
-        if value is not None:
-            if old_key in ["suns", "moons", "population", "diameter"]:
-                value = utl.to_int(value)
-            elif old_key == "gravity":
-                value = utl.to_gravity_value(value)
-            elif old_key == "orbital_period":
-                value = utl.to_float(value)
-            elif old_key in ["climate", "terrain"]:
-                value = utl.to_list(value, ", ")
+    plan = get_transform_plan(keys, "planet", none_values)
 
-        transformed_planet[new_key] = value
+    if as_record:
+        fields = tuple(new_key for old_key, new_key, convert in plan)
+        record_type = get_record_type("planet", fields)
+        return record_type(*[convert(data.get(old_key)) for old_key, new_key, convert in plan])
 
-    return transformed_planet
+    planet = {}
+    for old_key, new_key, convert in plan:
+        planet[new_key] = convert(data.get(old_key))
+    return planet
 
 
-def transform_starship(data, keys, none_values):
+def transform_starship(data, keys, none_values, as_record=False):
     """Returns a new "thinned" dictionary representation of a starship based on the passed in
     < data > dictionary with string values converted to more appropriate types.
 
@@ -470,8 +2297,8 @@ def transform_starship(data, keys, none_values):
 
     < data > values are converted to more appropriate types as outlined below under "Mappings".
     Strings found in < none_values > are converted to < None > irrespective of case. Type
-    conversions are delegated to the various < utl.to_*() > functions. If a new key lacks a
-    corresponding < data > value < None > is assigned.
+    conversions are delegated to the converters compiled by < get_transform_plan() >. If a new
+    key lacks a corresponding < data > value < None > is assigned.
 
     Each targeted < data > value is then mapped to the new key when assigning the new
     key-value pair to the new "starship" dictionary.
@@ -500,217 +2327,371 @@ def transform_starship(data, keys, none_values):
         data (dict): source data
         keys (dict): old key to new key mappings
         none_values (tuple): strings to convert to None
+        as_record (bool): return a compact < Record > rather than a dictionary
 
     Returns:
-        dict: new dictionary representation of a planet
+        dict|Record: new dictionary representation of a starship
     """
 
+    plan = get_transform_plan(keys, "starship", none_values)
+
+    if as_record:
+        fields = tuple(new_key for old_key, new_key, convert in plan)
+        record_type = get_record_type("starship", fields)
+        return record_type(*[convert(data.get(old_key)) for old_key, new_key, convert in plan])
+
     starship = {}
+    for old_key, new_key, convert in plan:
+        starship[new_key] = convert(data.get(old_key))
+    return starship
 
-    for old_key, new_key in keys["starship"].items():
-        value = data.get(old_key)
 
-        value = utl.to_none(value, none_values)
+def transform_columns(columns, keys, entity_type, none_values, as_table=False):
+    """Batch version of < transform_planet() > and < transform_starship() > that accepts
+    column-oriented data (see < read_csv_to_columns() >) rather than one dictionary per record.
+    Each column is converted in a single pass with the converter compiled for it by
+    < get_transform_plan() > so per-record function-call and dictionary overhead is
+    amortized across the whole dataset. Columns missing from < columns > are converted as if
+    every row lacked a value.
 
-        if old_key in ["length", "hyperdrive_rating"]:
-            value = utl.to_float(value)
-        elif old_key == "max_atmosphering_speed":
-            value = utl.to_int(value.replace(",", ""))
-        elif old_key in ["crew", "passengers", "cargo_capacity"]:
-            value = utl.to_int(value)
-        elif old_key == "armament":
-            value = utl.to_list(value, ",")
+    If < as_table > is True a dictionary of converted columns keyed by the new key names is
+    returned; otherwise a list of new dictionaries (one per row) identical to those returned by
+    < transform_planet() > or < transform_starship() > is returned.
 
-        starship[new_key] = value
+    Parameters:
+        columns (dict): column name and row values key-value pairs
+        keys (dict): old key to new key mappings
+        entity_type (str): "planet" or "starship"
+        none_values (tuple): strings to convert to None
+        as_table (bool): return converted columns rather than records
 
-    return starship
+    Returns:
+        list|dict: new dictionary representations of the records or converted columns
+    """
 
+    num_rows = len(next(iter(columns.values()), []))
+    table = {}
+    for old_key, new_key, convert in get_transform_plan(keys, entity_type, none_values):
+        column = columns.get(old_key)
+        if column is None:
+            table[new_key] = [convert(None) for i in range(num_rows)]
+        else:
+            table[new_key] = list(map(convert, column))
 
-def main():
-    """Entry point for program.
+    if as_table:
+        return table
+
+    new_keys = tuple(table.keys())
+    return [dict(zip(new_keys, row)) for row in zip(*table.values())]
+
+
+def traverse_swapi_graph(graph, category, name, related_category):
+    """Returns the < related_category > entities linked to the entity identified by
+    < category > and < name > in the passed in < graph > (see < build_swapi_graph >). For
+    example, the starships that appear in "A New Hope" or the people whose homeworld is
+    "Naboo". Traversal occurs in memory; related entities that are not present in the graph
+    are skipped.
+
+    WARN: Deep copies are returned for the same reason as < get_swapi_resource >. The
+    entities can be passed directly to < transform_sentient_being > or paired with an intruder
+    flag before boarding a starship.
 
     Parameters:
-        None
+        graph (dict): graph returned by < build_swapi_graph >
+        category (str): category of the starting entity (e.g., "films")
+        name (str): name (or title) of the starting entity (e.g., "A New Hope")
+        related_category (str): category of the entities to return (e.g., "starships")
+
+    Returns:
+        list: related entities
+    """
+
+    url = graph["names"].get((category, name))
+    related_urls = graph["adjacency"].get(url, {}).get(related_category, {})
+    entities = graph["entities"]
+
+    return [copy.deepcopy(entities[related_url]) for related_url in related_urls if related_url in entities]
+
+
+def write_json_stream(
+    filepath, data, encoding="utf-8", indent=2, compress=False, chunk_size=JSON_CHUNK_SIZE
+):
+    """Serializes object as JSON. Writes content to the provided filepath in buffered chunks
+    produced by < iter_json_chunks() > so that large structures (e.g., the news desk articles
+    or the full planets lists) are written with bounded memory and fewer write calls. Pass
+    indent=None for compact output. If < compress > is True the file is gzip-compressed.
+
+    Parameters:
+        filepath (str): the path to the file
+        data (dict)/(list): the data to be encoded as JSON and written to the file
+        encoding (str): name of encoding used to encode the file
+        indent (int): number of "pretty printed" indention spaces applied to encoded JSON
+        compress (bool): gzip-compress the file
+        chunk_size (int): approximate number of characters per write
 
     Returns:
         None
     """
 
-    # 3.1 CHALLENGE 01
+    if compress:
+        file_obj = gzip.open(filepath, "wt", encoding=encoding)
+    else:
+        file_obj = open(filepath, "w", encoding=encoding)
+
+    with file_obj:
+        for chunk in iter_json_chunks(data, indent, chunk_size):
+            file_obj.write(chunk)
+
+
+def write_json_atomic(filepath, data, encoding="utf-8", indent=2):
+    """Serializes object as JSON. Writes content to a temporary file located in the same
+    directory as < filepath > and then renames the temporary file to < filepath > with
+    < os.replace() >. Readers observe either the previous file or the complete new file, never
+    a partially written one. The temporary file is removed if serialization fails.
+
+    Parameters:
+        filepath (str): the path to the file
+        data (dict)/(list): the data to be encoded as JSON and written to the file
+        encoding (str): name of encoding used to encode the file
+        indent (int): number of "pretty printed" indention spaces applied to encoded JSON
 
-    assert utl.to_float("4") == 4.0
-    assert utl.to_float("506,000,000.9999") == 506000000.9999
-    assert utl.to_float("Darth Vader") == "Darth Vader"
+    Returns:
+        None
+    """
 
-    assert utl.to_int("506") == 506
-    assert utl.to_int("506,000,000.9999") == 506000000
-    assert utl.to_int("Ahsoka Tano") == "Ahsoka Tano"
+    fd, tmp_filepath = create_temp_file(filepath, ".json")
+    try:
+        with open(fd, "w", encoding=encoding) as file_obj:
+            file_obj.writelines(iter_json_chunks(data, indent))
+            file_obj.flush()
+            os.fsync(file_obj.fileno())
+        set_file_mode(tmp_filepath, filepath)
+        os.replace(tmp_filepath, filepath)
+    except BaseException:
+        os.remove(tmp_filepath)
+        raise
 
-    # 3.2 CHALLENGE 02
 
-    assert utl.to_list("Use the Force") == ["Use", "the", "Force"]
-    assert utl.to_list("X-wing|Y-wing", "|") == ["X-wing", "Y-wing"]
-    assert utl.to_list([506, 507], ", ") == [506, 507]
+def main():
+    """Entry point for program.
 
-    assert utl.to_none("", NONE_VALUES) is None
-    assert utl.to_none("N/A ", NONE_VALUES) is None
-    assert utl.to_none(" unknown", NONE_VALUES) is None
-    assert utl.to_none("Yoda", NONE_VALUES) == "Yoda"
-    assert utl.to_none(("41BBY", "19BBY"), NONE_VALUES) == ("41BBY", "19BBY")
+    Parameters:
+        None
 
-    # 3.3 CHALLENGE 03
-    clone_wars_episodes = utl.read_csv_to_dicts("./data-clone_wars_episodes.csv")
+    Returns:
+        None
+    """
 
-    count = 0
-    for episode in clone_wars_episodes:
-        if has_viewer_data(episode):
-            count += 1
-    assert count == 88
-
-    # 3.4 CHALLENGE 04
-    clone_wars_episodes = convert_episode_values(clone_wars_episodes, NONE_VALUES)
-    utl.write_json("stu-clone_wars-episodes_converted.json", clone_wars_episodes)
-
-    # 3.5 CHALLENGE 05
-    most_viewed_episode = get_most_viewed_episode(clone_wars_episodes)
-    print(most_viewed_episode)
-
-    # 3.6 CHALLENGE 06
-    articles = utl.read_json("./data-nyt_star_wars_articles.json")
-    news_desks = get_news_desks(articles, NONE_VALUES)
-    utl.write_json("stu-nyt_news_desks.json", news_desks)
-
-    # 3.7 CHALLENGE 07
-    news_desk_articles = group_articles_by_news_desk(news_desks, articles)
-    utl.write_json("stu-nyt_news_desk_articles.json", news_desk_articles)
-
-    # 3.8 CHALLENGE 08
-    wookiee_planets = utl.read_csv_to_dicts("data-wookieepedia_planets.csv")
-    wookiee_dagobah = utl.get_nested_dict(wookiee_planets, "name", "Dagobah")
-    utl.write_json("stu-wookiee_dagobah.json", wookiee_dagobah)
-
-    wookiee_haruun_kal = utl.get_nested_dict(wookiee_planets, "system", "Al'Har system")
-    utl.write_json("stu-wookiee_haruun_kal.json", wookiee_haruun_kal)
-
-    # 3.9 CHALLENGE 09
-    assert utl.to_year_era("1032BBY") == {"year": 1032, "era": "BBY"}
-    assert utl.to_year_era("19BBY") == {"year": 19, "era": "BBY"}
-    assert utl.to_year_era("0ABY") == {"year": 0, "era": "ABY"}
-    assert utl.to_year_era("Chewbacca") == "Chewbacca"
-
-    # 3.10 CHALLENGE 10
-    keys_path = Path("data-key_mappings.json").absolute()
-    keys = utl.read_json(keys_path)
-    harunn_kal = transform_planet(wookiee_haruun_kal, keys, NONE_VALUES)
-    # print(harunn_kal)
-    # print(type(harunn_kal))
-    utl.write_json("stu-haruun_kal.json", harunn_kal)
-
-    # 3.11 CHALLENGE 11
-    planets = [transform_planet(planet, keys, NONE_VALUES) for planet in wookiee_planets]
-    planets.sort(key=lambda x: x["name"], reverse=True)
-    utl.write_json("stu-planets_sorted_name.json", planets)
-    planets_diameter_km = sorted(planets, key=lambda x: (-x["diameter_km"] if x["diameter_km"] else 0, x["name"]))
-    utl.write_json("stu-planets_sorted_diameter.json", planets_diameter_km)
-
-    # 3.12 CHALLENGE 12
-    wookiee_starships = utl.read_csv_to_dicts("data-wookieepedia_starships.csv")
-    wookiee_twilight = utl.get_nested_dict(wookiee_starships, "name", "Twilight")
-    twilight = transform_starship(wookiee_twilight, keys, NONE_VALUES)
-    utl.write_json("stu-twilight.json", twilight)
-
-    # 3.13 CHALLENGE 13
-    wookiee_people = utl.read_json("data-wookieepedia_people.json")
-    wookiee_droids = utl.read_json("data-wookieepedia_droids.json")
-
-    # Fetch SWAPI data and combine it with Wookieepedia data
-    swapi_anakin = get_swapi_resource(SWAPI_PEOPLE, {"search": "Anakin Skywalker"})["results"][0]
-    wookiee_anakin = utl.get_nested_dict(wookiee_people, "name", swapi_anakin["name"])
-    swapi_anakin.update(wookiee_anakin)
-    anakin = transform_sentient_being(swapi_anakin, keys, NONE_VALUES, planets, is_droid=False)
-    utl.write_json("stu-anakin_skywalker.json", anakin)
-
-    swapi_r2_d2 = get_swapi_resource(SWAPI_PEOPLE, {"search": "R2-D2"})["results"][0]
-    wookiee_r2_d2 = utl.get_nested_dict(wookiee_droids, "name", swapi_r2_d2["name"])
-    swapi_r2_d2.update(wookiee_r2_d2)
-    r2_d2 = transform_sentient_being(swapi_r2_d2, keys, NONE_VALUES, planets, is_droid=True)
-    utl.write_json("stu-r2_d2.json", r2_d2)
-
-    swapi_obi_wan = get_swapi_resource(SWAPI_PEOPLE, {"search": "Obi-Wan Kenobi"})["results"][0]
-    wookiee_obi_wan = utl.get_nested_dict(wookiee_people, "name", swapi_obi_wan["name"])
-    swapi_obi_wan.update(wookiee_obi_wan)
-    obi_wan = transform_sentient_being(swapi_obi_wan, keys, NONE_VALUES, planets, is_droid=False)
-    utl.write_json("stu-obi_wan_kenobi.json", obi_wan)
-
-    # 3.14 CHALLENGE 14
-
-    # Test board_ship() function
-    # Retrieve and transform Padmé Amidala's data
-    swapi_padme = get_swapi_resource(SWAPI_PEOPLE, {"search": "Padmé Amidala"})["results"][0]
-    wookiee_padme = utl.get_nested_dict(wookiee_people, "name", swapi_padme["name"])
-    swapi_padme.update(wookiee_padme)
-    padme = transform_sentient_being(swapi_padme, keys, NONE_VALUES, planets, is_droid=False)
-    utl.write_json("stu-padme_amidala.json", padme)
-
-    # Retrieve and transform C-3PO's data
-    swapi_c_3po = get_swapi_resource(SWAPI_PEOPLE, {"search": "C-3PO"})["results"][0]
-    wookiee_c_3po = utl.get_nested_dict(wookiee_droids, "name", swapi_c_3po["name"])
-    swapi_c_3po.update(wookiee_c_3po)
-    c_3po = transform_sentient_being(swapi_c_3po, keys, NONE_VALUES, planets, is_droid=True)
-    utl.write_json("stu-c_3po.json", c_3po)
-
-    # Load Jedi data from JSON
-    jedi_path = Path("data-jedi.json").absolute()
-    jedi = utl.read_json(jedi_path)
-    ahsoka_tanu, mace_windu, plo_koon, shaak_ti, yoda = jedi
-
-    # Prepare test data for boarding the ship
-    test_crew_members = (anakin, obi_wan, mace_windu)
-    test_crew_positions = ("pilot", "copilot", "navigator")
-    test_passengers = [padme, c_3po, r2_d2, ahsoka_tanu, plo_koon, shaak_ti, yoda]
-
-    test_ship = {
-        "crew_size": 2,
-        "crew_members": None,
-        "max_passengers": 6,
-        "passengers_on_board": None,
-    }
+    # Queue stu-*.json output to a background writer (closed even if a challenge fails)
+    with JsonWriter() as writer:
+
+        # Parsed and converted reference data (snapshot rebuilt whenever a source file changes)
+        with profile_stage("reference data"):
+            reference = get_reference_data()
+
+        # 3.1 CHALLENGE 01
+        with profile_stage("3.1 CHALLENGE 01"):
+            assert utl.to_float("4") == 4.0
+            assert utl.to_float("506,000,000.9999") == 506000000.9999
+            assert utl.to_float("Darth Vader") == "Darth Vader"
+
+            assert utl.to_int("506") == 506
+            assert utl.to_int("506,000,000.9999") == 506000000
+            assert utl.to_int("Ahsoka Tano") == "Ahsoka Tano"
+
+        # 3.2 CHALLENGE 02
+        with profile_stage("3.2 CHALLENGE 02"):
+            assert utl.to_list("Use the Force") == ["Use", "the", "Force"]
+            assert utl.to_list("X-wing|Y-wing", "|") == ["X-wing", "Y-wing"]
+            assert utl.to_list([506, 507], ", ") == [506, 507]
+
+            assert utl.to_none("", NONE_VALUES) is None
+            assert utl.to_none("N/A ", NONE_VALUES) is None
+            assert utl.to_none(" unknown", NONE_VALUES) is None
+            assert utl.to_none("Yoda", NONE_VALUES) == "Yoda"
+            assert utl.to_none(("41BBY", "19BBY"), NONE_VALUES) == ("41BBY", "19BBY")
+
+        # 3.3 CHALLENGE 03
+        with profile_stage("3.3 CHALLENGE 03"):
+            count = 0
+            for episode in reference["clone_wars_episodes_raw"]:
+                if has_viewer_data(episode):
+                    count += 1
+            assert count == 88
+
+        # 3.4 CHALLENGE 04
+        with profile_stage("3.4 CHALLENGE 04"):
+            # Episode values converted by build_reference_snapshot()
+            clone_wars_episodes = reference["clone_wars_episodes"]
+            writer.write("stu-clone_wars-episodes_converted.json", clone_wars_episodes)
+
+        # 3.5 CHALLENGE 05
+        with profile_stage("3.5 CHALLENGE 05"):
+            most_viewed_episode = get_most_viewed_episode(clone_wars_episodes)
+            print(most_viewed_episode)
+
+        # 3.6 CHALLENGE 06
+        with profile_stage("3.6 CHALLENGE 06"):
+            articles = reference["articles"]
+            news_desks, news_desk_articles, news_desk_counts = group_articles_by_news_desk_single_pass(
+                articles, NONE_VALUES
+            )
+            writer.write("stu-nyt_news_desks.json", news_desks)
+
+        # 3.7 CHALLENGE 07
+        with profile_stage("3.7 CHALLENGE 07"):
+            writer.write("stu-nyt_news_desk_articles.json", news_desk_articles)
+
+        # 3.8 CHALLENGE 08
+        with profile_stage("3.8 CHALLENGE 08"):
+            wookiee_planets = IndexedCollection(reference["wookiee_planets"])
+            wookiee_dagobah = get_nested_dict(wookiee_planets, "name", "Dagobah")
+            writer.write("stu-wookiee_dagobah.json", wookiee_dagobah)
+
+            wookiee_haruun_kal = get_nested_dict(wookiee_planets, "system", "Al'Har system")
+            writer.write("stu-wookiee_haruun_kal.json", wookiee_haruun_kal)
+
+        # 3.9 CHALLENGE 09
+        with profile_stage("3.9 CHALLENGE 09"):
+            assert utl.to_year_era("1032BBY") == {"year": 1032, "era": "BBY"}
+            assert utl.to_year_era("19BBY") == {"year": 19, "era": "BBY"}
+            assert utl.to_year_era("0ABY") == {"year": 0, "era": "ABY"}
+            assert utl.to_year_era("Chewbacca") == "Chewbacca"
+            assert to_year_era_cached("1032BBY") == utl.to_year_era("1032BBY")
+
+        # 3.10 CHALLENGE 10
+        with profile_stage("3.10 CHALLENGE 10"):
+            keys = reference["keys"]
+            harunn_kal = transform_planet(wookiee_haruun_kal, keys, NONE_VALUES)
+            # print(harunn_kal)
+            # print(type(harunn_kal))
+            writer.write("stu-haruun_kal.json", harunn_kal)
+
+        # 3.11 CHALLENGE 11
+        with profile_stage("3.11 CHALLENGE 11"):
+            planet_views = SortedViews(reference["planets"])  # see build_reference_snapshot()
+            planet_views.add_view("name", key=lambda x: x["name"], reverse=True)
+            planet_views.add_view(
+                "diameter_km", key=lambda x: (-x["diameter_km"] if x["diameter_km"] else 0, x["name"])
+            )
+            planets = IndexedCollection(planet_views.iter_view("name"))
+            writer.write("stu-planets_sorted_name.json", planets)
+            planets_diameter_km = planet_views.top("diameter_km")
+            writer.write("stu-planets_sorted_diameter.json", planets_diameter_km)
+
+        # 3.12 CHALLENGE 12
+        with profile_stage("3.12 CHALLENGE 12"):
+            wookiee_starships = IndexedCollection(reference["wookiee_starships"])
+            wookiee_twilight = get_nested_dict(wookiee_starships, "name", "Twilight")
+            twilight = transform_starship(wookiee_twilight, keys, NONE_VALUES)
+            writer.write("stu-twilight.json", twilight)
+
+        # 3.13 CHALLENGE 13
+        with profile_stage("3.13 CHALLENGE 13"):
+            wookiee_people = IndexedCollection(reference["wookiee_people"])
+            wookiee_droids = IndexedCollection(reference["wookiee_droids"])
+
+            # Fetch SWAPI data and combine it with Wookieepedia data (one hash join per collection)
+            swapi_people = [
+                get_swapi_resource(SWAPI_PEOPLE, {"search": name})["results"][0]
+                for name in ("Anakin Skywalker", "Obi-Wan Kenobi", "Padmé Amidala")
+            ]
+            swapi_anakin, swapi_obi_wan, swapi_padme = join_swapi_wookiee(swapi_people, wookiee_people)
+
+            swapi_droids = [
+                get_swapi_resource(SWAPI_PEOPLE, {"search": name})["results"][0]
+                for name in ("R2-D2", "C-3PO")
+            ]
+            swapi_r2_d2, swapi_c_3po = join_swapi_wookiee(swapi_droids, wookiee_droids)
+
+            homeworlds = {}  # transformed homeworlds keyed by planet URL
+            anakin = transform_sentient_being(
+                swapi_anakin, keys, NONE_VALUES, planets, is_droid=False, homeworlds=homeworlds
+            )
+            writer.write("stu-anakin_skywalker.json", anakin)
+
+            r2_d2 = transform_sentient_being(
+                swapi_r2_d2, keys, NONE_VALUES, planets, is_droid=True, homeworlds=homeworlds
+            )
+            writer.write("stu-r2_d2.json", r2_d2)
+
+            obi_wan = transform_sentient_being(
+                swapi_obi_wan, keys, NONE_VALUES, planets, is_droid=False, homeworlds=homeworlds
+            )
+            writer.write("stu-obi_wan_kenobi.json", obi_wan)
+
+        # 3.14 CHALLENGE 14
+        with profile_stage("3.14 CHALLENGE 14"):
+            # Test board_ship() function
+            # Transform Padmé Amidala's data
+            padme = transform_sentient_being(
+                swapi_padme, keys, NONE_VALUES, planets, is_droid=False, homeworlds=homeworlds
+            )
+            writer.write("stu-padme_amidala.json", padme)
+
+            # Transform C-3PO's data
+            c_3po = transform_sentient_being(
+                swapi_c_3po, keys, NONE_VALUES, planets, is_droid=True, homeworlds=homeworlds
+            )
+            writer.write("stu-c_3po.json", c_3po)
+
+            # Jedi data (see build_reference_snapshot())
+            jedi = reference["jedi"]
+            ahsoka_tanu, mace_windu, plo_koon, shaak_ti, yoda = jedi
+
+            # Prepare test data for boarding the ship
+            test_crew_members = (anakin, obi_wan, mace_windu)
+            test_crew_positions = ("pilot", "copilot", "navigator")
+            test_passengers = [padme, c_3po, r2_d2, ahsoka_tanu, plo_koon, shaak_ti, yoda]
+
+            test_ship = {
+                "crew_size": 2,
+                "crew_members": None,
+                "max_passengers": 6,
+                "passengers_on_board": None,
+            }
 
-    test_ship = board_ship(test_ship, test_crew_members, test_crew_positions, test_passengers)
-    #print(test_ship["crew_members"])
-    #print(test_ship["passengers_on_board"])
-    #print([
-    #    padme,
-    #    c_3po,
-    #    r2_d2,
-    #    ahsoka_tanu,
-    #    plo_koon,
-    #    shaak_ti,
-    #])
-
-    assert test_ship["crew_members"] == {
-        "pilot": anakin,
-        "copilot": obi_wan,
-    }
-    assert test_ship["passengers_on_board"] == [
-        padme,
-        c_3po,
-        r2_d2,
-        ahsoka_tanu,
-        plo_koon,
-        shaak_ti,
-    ]
-
-    twilight = board_ship(twilight, (anakin, obi_wan), ("pilot", "copilot"), [padme, c_3po, r2_d2])
-    r2_d2["instructions"] = ["Power up the engines"]
-
-    # 3.15 CHALLENGE 15
-    naboo = utl.get_nested_dict(planets, "diameter_km", 12120)
-    r2_d2["instructions"].append(f"Plot course for Naboo, {naboo['region']}, {naboo['sector']}")
-    # "Plot course for Naboo, Mid Rim Territories, Chommell sector"
-    # "Plot course for Naboo, Mid Rim Territories, Chommell sector"
-    r2_d2["instructions"].append("Release the docking clamp")
-    utl.write_json("stu-twilight_departs.json", twilight)
+            test_ship = board_ship(test_ship, test_crew_members, test_crew_positions, test_passengers)
+            #print(test_ship["crew_members"])
+            #print(test_ship["passengers_on_board"])
+            #print([
+            #    padme,
+            #    c_3po,
+            #    r2_d2,
+            #    ahsoka_tanu,
+            #    plo_koon,
+            #    shaak_ti,
+            #])
+
+            assert test_ship["crew_members"] == {
+                "pilot": anakin,
+                "copilot": obi_wan,
+            }
+            assert test_ship["passengers_on_board"] == [
+                padme,
+                c_3po,
+                r2_d2,
+                ahsoka_tanu,
+                plo_koon,
+                shaak_ti,
+            ]
+
+            twilight = board_ship(twilight, (anakin, obi_wan), ("pilot", "copilot"), [padme, c_3po, r2_d2])
+            r2_d2["instructions"] = ["Power up the engines"]
+
+        # 3.15 CHALLENGE 15
+        with profile_stage("3.15 CHALLENGE 15"):
+            naboo = get_nested_dict(planets, "diameter_km", 12120)
+            r2_d2["instructions"].append(f"Plot course for Naboo, {naboo['region']}, {naboo['sector']}")
+            # "Plot course for Naboo, Mid Rim Territories, Chommell sector"
+            # "Plot course for Naboo, Mid Rim Territories, Chommell sector"
+            r2_d2["instructions"].append("Release the docking clamp")
+            writer.write("stu-twilight_departs.json", twilight)
+
+        with profile_stage("flush"):
+            writer.flush()  # flush barrier
+
+    report_stage_profiles()
 
 
 if __name__ == "__main__":
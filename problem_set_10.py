@@ -3,6 +3,8 @@ import csv
 import requests
 import pprint
 
+from concurrent.futures import ThreadPoolExecutor
+
 print("\nProblem Set 10")
 print("\n20th Century Fox")
 print("\nA LUCASFILM LIMITED Production")
@@ -11,6 +13,8 @@ print("\nSWAPI: The Star Wars API")
 
 # SETUP CODE
 ENDPOINT = "https://swapi.py4e.com/api"
+BOARDING_BATCH_SIZE = 1000
+MAX_WORKERS = 8
 
 dialogue = {
     "C-3PO": [
@@ -71,6 +75,75 @@ def board_starship(starship, people):
 
     return starship
 
+def board_starship_from_csv(
+    starship,
+    filepath,
+    max_passengers=None,
+    batch_size=BOARDING_BATCH_SIZE,
+    encoding="utf-8-sig",
+    newline="",
+    delimiter=",",
+):
+    """Bulk boarding mode for large manifests. Streams rows from the .csv file located at
+    < filepath > (e.g., data-troopers.csv) straight onto the < starship > without first
+    building a list of (person, intruder) tuples. Each row is a dictionary representing a
+    person; its "intruder" value ("0" or "1") determines whether the person is added to the
+    'intruders' or 'passengers' list.
+
+    Rows are partitioned into pending batches that are added to the starship's lists with
+    < list.extend() > once < batch_size > rows have accumulated. As with < board_starship >,
+    the 'intruders' and 'passengers' keys are only created when someone is boarded.
+
+    If < max_passengers > is provided the 'passengers' list (including passengers already on
+    board) is not permitted to exceed it; additional passengers are turned away. Intruders
+    do not ask permission to board and are not subject to the limit.
+
+    Parameters:
+        starship (dict): a dictionary representation of the decoded JSON that contains
+                         starship attributes.
+        filepath (str): path to csv file
+        max_passengers (int): optional passenger capacity
+        batch_size (int): number of rows to accumulate before extending a list
+        encoding (str): name of encoding used to decode the file
+        newline (str): specifies replacement value for newline '\n'
+                       or '\r\n' (Windows) character sequences
+        delimiter (str): delimiter that separates the row values
+
+    Returns:
+        dict: an updated dictionary of key-value pairs representing a starship.
+    """
+
+    def flush(key, batch):
+        if batch:
+            starship.setdefault(key, []).extend(batch)
+            batch.clear()
+
+    if max_passengers is None:
+        seats = float("inf")
+    else:
+        seats = max(max_passengers - len(starship.get("passengers", [])), 0)
+
+    passengers = []
+    intruders = []
+
+    with open(filepath, "r", newline=newline, encoding=encoding) as file_obj:
+        for person in csv.DictReader(file_obj, delimiter=delimiter):
+            if int(person["intruder"]):
+                intruders.append(person)
+                if len(intruders) >= batch_size:
+                    flush("intruders", intruders)
+            elif seats > 0:
+                seats -= 1
+                passengers.append(person)
+                if len(passengers) >= batch_size:
+                    flush("passengers", passengers)
+
+    flush("passengers", passengers)
+    flush("intruders", intruders)
+
+    return starship
+
+
 def capture_starship(attacker, prey):
     """Utilizes a conditional statement to check if the key 'primary_docking_bay'
     is not already present in the decoded JSON representing an attacking starship.                                                     .
@@ -102,6 +175,25 @@ def capture_starship(attacker, prey):
     return attacker
 
 
+def create_people(people, max_workers=MAX_WORKERS):
+    """Concurrently calls < create_person > for each person in the passed in < people > list.
+    Each call blocks on a homeworld lookup so the calls are dispatched to a bounded thread pool
+    (no more than < max_workers > threads). The new person dictionaries are returned in the
+    same order as < people >.
+
+    Parameters:
+        people (list): dictionary representations of the decoded JSON that contain
+                       people attributes.
+        max_workers (int): maximum number of concurrent lookups
+
+    Returns:
+        list: dictionaries of key-value pairs representing people.
+    """
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(create_person, people))
+
+
 def create_person(person):
     """Returns a dictionary literal with the following keys:
 
@@ -161,6 +253,99 @@ def create_starship(starship):
     }
 
 
+def decode_refs(data):
+    """Returns a copy of the passed in < data > (see < encode_refs >) in which every
+    {"$ref": < JSON pointer >} dictionary is replaced by the object located at the
+    pointer and every {"$literal": < dictionary >} wrapper is replaced by the dictionary it
+    wraps. Shared objects are restored as shared objects (i.e., not copies). Pointers
+    always refer to an object that precedes them in document order so objects are resolved
+    in a single depth-first pass.
+
+    Parameters:
+        data (dict)/(list): the data to be decoded
+
+    Returns:
+        dict|list: copy of < data > with $ref pointers resolved
+    """
+
+    objects = {}
+
+    def decode(obj, pointer):
+        if isinstance(obj, dict):
+            if len(obj) == 1 and "$ref" in obj:
+                return objects[obj["$ref"]]
+            if len(obj) == 1 and "$literal" in obj:
+                obj = obj["$literal"]  # escaped data dictionary
+            decoded = objects[pointer] = {}
+            for key, value in obj.items():
+                decoded[key] = decode(value, f"{pointer}/{escape_pointer_token(key)}")
+            return decoded
+        if isinstance(obj, list):
+            decoded = objects[pointer] = []
+            for i, value in enumerate(obj):
+                decoded.append(decode(value, f"{pointer}/{i}"))
+            return decoded
+        return obj
+
+    return decode(data, "#")
+
+
+def encode_refs(data):
+    """Returns a copy of the passed in < data > in which every dictionary or list that is
+    encountered more than once (i.e., the same object is shared by several parents) is only
+    included at its first position. Each subsequent occurrence is replaced by a
+    {"$ref": < JSON pointer >} dictionary (e.g., {"$ref": "#/escaped_passengers/0"}) that
+    points to the first occurrence. Objects are tracked by identity in a single depth-first
+    pass so the work done is linear in the number of distinct objects.
+
+    A data dictionary that would be mistaken for a pointer or a wrapper on decoding (i.e.,
+    its only key is "$ref" or "$literal") is escaped by wrapping it in a
+    {"$literal": < dictionary >} dictionary.
+
+    Use < decode_refs > to restore the shared objects.
+
+    Parameters:
+        data (dict)/(list): the data to be encoded
+
+    Returns:
+        dict|list: copy of < data > with repeated objects replaced by $ref pointers
+    """
+
+    pointers = {}
+
+    def encode(obj, pointer):
+        if not isinstance(obj, (dict, list)):
+            return obj
+        if id(obj) in pointers:
+            return {"$ref": pointers[id(obj)]}
+        pointers[id(obj)] = pointer
+        if isinstance(obj, dict):
+            encoded = {
+                key: encode(value, f"{pointer}/{escape_pointer_token(key)}")
+                for key, value in obj.items()
+            }
+            if len(obj) == 1 and ("$ref" in obj or "$literal" in obj):
+                return {"$literal": encoded}
+            return encoded
+        return [encode(value, f"{pointer}/{i}") for i, value in enumerate(obj)]
+
+    return encode(data, "#")
+
+
+def escape_pointer_token(key):
+    """Escapes a dictionary < key > for use as a JSON pointer reference token
+    ("~" -> "~0", "/" -> "~1").
+
+    Parameters:
+        key (str): dictionary key
+
+    Returns:
+        str: escaped reference token
+    """
+
+    return str(key).replace("~", "~0").replace("/", "~1")
+
+
 def get_homeworld(url):
     """Attempts to retrieve a SWAPI representation of a home planet using the provided
     < url >. The < url > is assumed to be a SWAPI planet URL
@@ -211,6 +396,31 @@ def get_swapi_resource(url, params=None, timeout=10):
         return requests.get(url, timeout=timeout).json()
 
 
+def get_swapi_resources(lookups, timeout=10, max_workers=MAX_WORKERS):
+    """Concurrently retrieves the SWAPI resources described by the passed in < lookups > list.
+    Each lookup is a (< url >, < params >) tuple that is passed to the function
+    < get_swapi_resource() >. The lookups are independent of one another and are dispatched to a
+    bounded thread pool (no more than < max_workers > threads) so that the total wait time is
+    close to that of the slowest single request. Results are returned in request order.
+
+    Example:
+    [(< url >, {"search": < term >}), (< url >, None)]
+
+    Parameters:
+        lookups (list): (url, params) tuples
+        timeout (int): timeout value in seconds
+        max_workers (int): maximum number of concurrent requests
+
+    Returns:
+        list: dictionary representations of the decoded JSON in request order.
+    """
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(
+            executor.map(lambda lookup: get_swapi_resource(*lookup, timeout=timeout), lookups)
+        )
+
+
 def insert_dialogue(person, dialogue):
     """Loops over the < dialogue > dictionary key-value pairs accessing the dictionary's
     items leveraging the dictionary method `dict.items()`. Utilizes a conditional statement
@@ -265,7 +475,26 @@ def read_csv_to_dicts(filepath, encoding="utf-8-sig", newline="", delimiter=",")
         return data
 
 
-def write_json(filepath, data, encoding="utf-8", indent=2):
+def read_json(filepath, encoding="utf-8", resolve_refs=False):
+    """Reads a JSON document, decodes the file content, and returns a list or dictionary if
+    provided with a valid filepath. If < resolve_refs > is True, the "$ref" pointers written by
+    < write_json(..., preserve_refs=True) > are resolved (see < decode_refs >).
+
+    Parameters:
+        filepath (str): path to file
+        encoding (str): name of encoding used to decode the file
+        resolve_refs (bool): resolve "$ref" pointers to shared objects
+
+    Returns:
+        dict/list: dict or list representations of the decoded JSON document
+    """
+
+    with open(filepath, "r", encoding=encoding) as file_obj:
+        data = json.load(file_obj)
+    return decode_refs(data) if resolve_refs else data
+
+
+def write_json(filepath, data, encoding="utf-8", indent=2, preserve_refs=False):
     """Serializes object as JSON. Writes content to the provided filepath.
 
     Parameters:
@@ -279,10 +508,16 @@ def write_json(filepath, data, encoding="utf-8", indent=2):
         indent (int): number of "pretty printed" indention spaces applied to
         encoded JSON
 
+        preserve_refs (bool): write each shared object once and replace repeats
+        with "$ref" pointers (see < encode_refs >)
+
     Returns:
         None
     """
 
+    if preserve_refs:
+        data = encode_refs(data)
+
     with open(filepath, "w", encoding=encoding) as file_obj:
         json.dump(data, file_obj, indent=indent)
 
@@ -310,7 +545,32 @@ def main():
     SWAPI_PEOPLE = f"{ENDPOINT}/people"
 
     # TODO 1.2
-    swapi_new_hope = get_swapi_resource(SWAPI_FILMS, params={"search": "new hope"})["results"][0]
+    # The searches are independent of one another; dispatch them concurrently
+    (
+        swapi_new_hope,
+        swapi_corvette,
+        swapi_stardestroyer,
+        swapi_r2d2,
+        swapi_c3po,
+        swapi_leia,
+        swapi_vader,
+    ) = [
+        resource["results"][0]
+        for resource in get_swapi_resources(
+            [
+                (SWAPI_FILMS, {"search": "new hope"}),
+                (SWAPI_STARSHIPS, {"search": "CR90 corvette"}),
+                (SWAPI_STARSHIPS, {"search": "destroyer"}),
+                (SWAPI_PEOPLE, {"search": "R2-D2"}),
+                (SWAPI_PEOPLE, {"search": "C-3PO"}),
+                (SWAPI_PEOPLE, {"search": "Leia Organa"}),
+                (SWAPI_PEOPLE, {"search": "vader"}),
+            ]
+        )
+    ]
+
+    # Each create_person() call blocks on a homeworld lookup
+    r2d2, c3po, leia, vader = create_people([swapi_r2d2, swapi_c3po, swapi_leia, swapi_vader])
 
     # Problem 02
     print("\nProblem 02:")
@@ -332,30 +592,15 @@ def main():
     print("\nProblem 03:")
 
     # TODO 3.3
-    params = {"search": "CR90 corvette"}
-    swapi_corvette = get_swapi_resource(SWAPI_STARSHIPS, params)["results"][0]
     corvette = create_starship(swapi_corvette)
 
     # TODO 3.4
-    params = {"search": "destroyer"}
-    swapi_stardestroyer = get_swapi_resource(SWAPI_STARSHIPS, params)["results"][0]
     stardestroyer = create_starship(swapi_stardestroyer)
 
     # Problem 04
     print("\nProblem 04:")
 
-    # TODO 4.3
-    params = {"search": "R2-D2"}
-    swapi_r2d2 = get_swapi_resource(SWAPI_PEOPLE, params)["results"][0]
-    r2d2 = create_person(swapi_r2d2)
-
-    params = {"search": "C-3PO"}
-    swapi_c3po = get_swapi_resource(SWAPI_PEOPLE, params)["results"][0]
-    c3po = create_person(swapi_c3po)
-
-    params = {"search": "Leia Organa"}
-    swapi_leia = get_swapi_resource(SWAPI_PEOPLE, params)["results"][0]
-    leia = create_person(swapi_leia)
+    # TODO 4.3 (r2d2, c3po, and leia created concurrently in TODO 1.2)
 
     # TODO 4.4
     assert get_homeworld(swapi_r2d2["homeworld"]) == {
@@ -386,14 +631,9 @@ def main():
     # Problem 06
     print("\nProblem 06:")
 
-    # TODO 6.1
-    troopers = read_csv_to_dicts("data-troopers.csv")
-
-    # TODO 6.2
-    trooper_list = [(trooper, bool(int(trooper["intruder"]))) for trooper in troopers]
-
-    # TODO 6.3
-    corvette = board_starship(corvette, trooper_list)
+    # TODO 6.1 - 6.3
+    # Stream the troopers straight from the file rather than building a trooper list first
+    corvette = board_starship_from_csv(corvette, "data-troopers.csv")
 
     # Problem 07
     print("\nProblem 07:")
@@ -411,11 +651,7 @@ def main():
     # Problem 09
     print("\nProblem 09:")
 
-    # TODO 9.1.1
-    swapi_vader = get_swapi_resource(SWAPI_PEOPLE, {"search": "vader"})["results"][0]
-
-    # TODO 9.1.2
-    vader = create_person(swapi_vader)
+    # TODO 9.1.1 and 9.1.2 (vader retrieved and created concurrently in TODO 1.2)
 
     # TODO 9.1.3
     people = [(vader, True)]
@@ -441,6 +677,10 @@ def main():
 
     # TODO 10.4
     write_json("stu-newhope_final.json", new_hope)
+    write_json("stu-newhope_final_refs.json", new_hope, preserve_refs=True)
+
+    literal = {"x": {"$ref": "user data"}, "y": {"$literal": [1]}}
+    assert decode_refs(encode_refs(literal)) == literal
 
 
 if __name__ == "__main__":